@@ -0,0 +1,112 @@
+import json
+import os
+from collections import Counter
+from typing import Dict
+import pandas as pd
+
+DIMENSIONES = {
+    "roles": 'rol_1era_prioridad',
+    "experiencia": 'categoria_experiencia',
+    "edad": 'grupo_edad',
+    "motivacion": 'categoria_motivacion',
+    "compromiso": 'compromiso',
+    "nivel_real": 'nivel_experiencia_real',
+}
+
+TOTALES = ["filas", "edad_validas", "portafolio", "con_jams", "tiene_proyectos"]
+SUMAS = ["edad", "jams"]
+
+
+class AlmacenAgregados:
+
+    VERSION = 1
+
+    def __init__(self):
+        self.conteos: Dict[str, Counter] = {dim: Counter() for dim in DIMENSIONES}
+        self.skills = Counter()
+        self.totales = {nombre: 0 for nombre in TOTALES}
+        self.sumas = {nombre: 0.0 for nombre in SUMAS}
+
+    @property
+    def filas(self) -> int:
+        return self.totales["filas"]
+
+    @classmethod
+    def desde_df(cls, df: pd.DataFrame) -> "AlmacenAgregados":
+        agregados = cls()
+        agregados.sumar(df)
+        return agregados
+
+    def sumar(self, df: pd.DataFrame, signo: int = 1):
+        if len(df) == 0:
+            return
+        for dim, columna in DIMENSIONES.items():
+            for categoria, cantidad in df[columna].value_counts().items():
+                self.conteos[dim][str(categoria)] += signo * int(cantidad)
+        for skill, cantidad in df['skills'].explode().dropna().value_counts().items():
+            self.skills[str(skill)] += signo * int(cantidad)
+
+        edad = pd.to_numeric(df['Edad'], errors='coerce')
+        self.totales["filas"] += signo * len(df)
+        self.totales["edad_validas"] += signo * int(edad.notna().sum())
+        self.totales["portafolio"] += signo * int(df['tiene_portafolio'].astype(bool).sum())
+        self.totales["con_jams"] += signo * int((df['jams_previas'] > 0).sum())
+        self.totales["tiene_proyectos"] += signo * int((df['tiene_proyectos'] == True).sum())
+        self.sumas["edad"] += signo * float(edad.sum())
+        self.sumas["jams"] += signo * float(df['jams_previas'].sum())
+
+        for contador in list(self.conteos.values()) + [self.skills]:
+            for clave in [k for k, v in contador.items() if v <= 0]:
+                del contador[clave]
+
+    def restar(self, df: pd.DataFrame):
+        self.sumar(df, signo=-1)
+
+    def distribucion(self, dimension: str) -> pd.Series:
+        contador = self.skills if dimension == "skills" else self.conteos[dimension]
+        ordenados = sorted(contador.items(), key=lambda item: (-item[1], item[0]))
+        return pd.Series(
+            [cantidad for _, cantidad in ordenados],
+            index=[categoria for categoria, _ in ordenados],
+            dtype='int64'
+        )
+
+    def conteo(self, dimension: str, categoria: str) -> int:
+        return self.conteos[dimension].get(categoria, 0)
+
+    def moda(self, dimension: str, default: str = "No especificado") -> str:
+        contador = self.conteos[dimension]
+        if not contador:
+            return default
+        return min(contador.items(), key=lambda item: (-item[1], item[0]))[0]
+
+    def guardar(self, ruta: str):
+        datos = {
+            "version": self.VERSION,
+            "conteos": {dim: dict(contador) for dim, contador in self.conteos.items()},
+            "skills": dict(self.skills),
+            "totales": self.totales,
+            "sumas": self.sumas,
+        }
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def cargar(cls, ruta: str):
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if datos.get("version") != cls.VERSION:
+            return None
+
+        agregados = cls()
+        for dim in DIMENSIONES:
+            agregados.conteos[dim] = Counter(datos["conteos"].get(dim, {}))
+        agregados.skills = Counter(datos["skills"])
+        agregados.totales.update(datos["totales"])
+        agregados.sumas.update(datos["sumas"])
+        return agregados
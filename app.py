@@ -1,8 +1,7 @@
+import math
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from data_processor import DataProcessor
-import pandas as pd
+from artefactos import cargar_artefactos, version_artefactos
+from filtros import ETIQUETAS_FILTROS, PRIORIDADES_ROL, clave_filtros
 
 st.set_page_config(
     page_title="Dashboard GGJ Arequipa 2026",
@@ -134,35 +133,52 @@ st.markdown("""
 st.title("Dashboard Global Game Jam Arequipa 2026")
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    with st.spinner('Procesando datos con Llama 3.2...'):
-        processor = DataProcessor("data/inscripciones.csv", use_cache=True)
-    return processor
+@st.cache_resource(max_entries=2)
+def load_data(version: str):
+    return cargar_artefactos("data")
 
-try:
-    processor = load_data()
-    
+@st.cache_resource(max_entries=256)
+def figura(grafico: str, version: str, estado: tuple, _datos):
+    # Una figura por (gráfico, versión de datos, estado de filtros); _datos no forma parte de la clave.
+    # plotly se importa recién aquí, así KPIs y alertas se envían antes de pagar su import
+    import graficos
+    return graficos.CONSTRUCTORES[grafico](_datos())
+
+def mostrar_figura(grafico: str, artefactos, estado: tuple, datos):
+    st.plotly_chart(figura(grafico, artefactos.version, estado, datos), use_container_width=True)
+
+def filtros_sidebar(indice) -> dict:
+    st.sidebar.header("Filtros")
+    prioridad = PRIORIDADES_ROL[st.sidebar.selectbox("Prioridad del rol", list(PRIORIDADES_ROL))]
+    seleccion = {prioridad: st.sidebar.multiselect("Rol", indice.opciones(prioridad))}
+    for nombre, etiqueta in ETIQUETAS_FILTROS.items():
+        seleccion[nombre] = st.sidebar.multiselect(etiqueta, indice.opciones(nombre))
+    return seleccion
+
+# Cada sección es un fragmento: un widget dentro de una sección solo vuelve a ejecutar esa sección
+
+@st.fragment
+def seccion_resumen(kpis: dict):
     st.header("Resumen General")
     
-    kpis = processor.get_kpis()
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.metric("Total Inscritos", int(kpis['total_inscritos']))
     
+    # Sin inscritos (filtros que no dejan a nadie) o sin edades válidas no hay promedio que mostrar
+    hay_inscritos = kpis['total_inscritos'] > 0
     with col2:
-        st.metric("Edad Promedio", f"{kpis['edad_promedio']:.1f} años")
+        edad = kpis['edad_promedio']
+        st.metric("Edad Promedio", f"{edad:.1f} años" if hay_inscritos and math.isfinite(edad) else "—")
     
     with col3:
-        st.metric("Con Portafolio", f"{kpis['porcentaje_portafolio']:.0f}%")
-    
-    st.markdown("---")
-    
+        st.metric("Con Portafolio", f"{kpis['porcentaje_portafolio']:.0f}%" if hay_inscritos else "—")
+
+@st.fragment
+def seccion_alertas(alerts: list):
     st.header("Alertas de Roles")
     
-    alerts = processor.get_deficit_alerts()
-    
     if alerts:
         alertas_criticas = [a for a in alerts if a['nivel'] == 'CRÍTICO']
         alertas_bajas = [a for a in alerts if a['nivel'] == 'BAJO']
@@ -195,150 +211,53 @@ try:
             No hay déficit crítico de roles
         </div>
         """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    st.header("Análisis de Inscripciones")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Roles - 1era Prioridad")
-        roles_dist = processor.get_roles_distribution()
-        
-        colors = ['#ef4444' if v <= 3 else '#f59e0b' if v <= 5 else '#10b981' 
-                  for v in roles_dist.values]
-        
-        fig_roles = go.Figure(go.Bar(
-            x=roles_dist.values,
-            y=roles_dist.index,
-            orientation='h',
-            marker_color=colors,
-            text=roles_dist.values,
-            textposition='outside'
-        ))
-        fig_roles.update_layout(
-            showlegend=False, 
-            height=400, 
-            xaxis_title="Cantidad", 
-            yaxis_title="",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_roles, use_container_width=True)
-    
-    with col2:
-        st.subheader("Nivel de Experiencia (1-5)")
-        exp_dist = processor.get_experiencia_distribution()
-        orden_exp = ['1', '2', '3', '4', '5']
-        exp_ordenado = exp_dist.reindex(orden_exp, fill_value=0)
-        
-        fig_exp = px.bar(
-            x=exp_ordenado.index,
-            y=exp_ordenado.values,
-            labels={'x': 'Nivel', 'y': 'Cantidad'},
-            color=exp_ordenado.values,
-            color_continuous_scale='RdYlGn'
-        )
-        fig_exp.update_layout(
-            height=400, 
-            showlegend=False,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_exp, use_container_width=True)
-    
-    col3, col4 = st.columns(2)
-    
-    with col3:
-        st.subheader("Distribución de Edades")
-        edad_dist = processor.get_edad_distribution()
-        fig_edad = px.bar(
-            x=edad_dist.index,
-            y=edad_dist.values,
-            labels={'x': 'Grupo de Edad', 'y': 'Cantidad'},
-            color=edad_dist.values,
-            color_continuous_scale='Blues'
-        )
-        fig_edad.update_layout(
-            showlegend=False, 
-            height=400,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_edad, use_container_width=True)
-    
-    with col4:
-        st.subheader("Motivaciones")
-        motiv_dist = processor.get_motivacion_distribution()
-        fig_motiv = px.pie(
-            values=motiv_dist.values,
-            names=motiv_dist.index,
-            color_discrete_sequence=px.colors.sequential.Greens_r
-        )
-        fig_motiv.update_layout(
-            height=400,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_motiv, use_container_width=True)
-    
-    st.markdown("---")
-    
-    col5, col6 = st.columns(2)
-    
-    with col5:
-        st.subheader("Nivel de Compromiso")
-        comp_dist = processor.get_compromiso_distribution()
-        
-        colors_comp = {'Alto': '#10b981', 'Medio': '#f59e0b', 'Bajo': '#ef4444'}
-        fig_comp = go.Figure(go.Bar(
-            x=comp_dist.index,
-            y=comp_dist.values,
-            marker_color=[colors_comp.get(x, '#95a5a6') for x in comp_dist.index],
-            text=comp_dist.values,
-            textposition='outside'
-        ))
-        fig_comp.update_layout(
-            showlegend=False,
-            height=400,
-            xaxis_title="",
-            yaxis_title="Cantidad",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_comp, use_container_width=True)
-    
-    with col6:
-        st.subheader("Skills Técnicas Mencionadas")
-        skills_dist = processor.get_skills_distribution()
-        
-        if len(skills_dist) > 0:
-            fig_skills = px.bar(
-                x=skills_dist.values,
-                y=skills_dist.index,
-                orientation='h',
-                labels={'x': 'Menciones', 'y': ''},
-                color=skills_dist.values,
-                color_continuous_scale='Oranges'
-            )
-            fig_skills.update_layout(
-                showlegend=False, 
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig_skills, use_container_width=True)
-        else:
-            st.info("No se encontraron skills técnicas mencionadas explícitamente")
-    
-    st.markdown("---")
-    
+
+@st.fragment
+def grafico_roles(artefactos, mascara, estado: tuple):
+    etiquetas = [etiqueta for etiqueta in PRIORIDADES_ROL if PRIORIDADES_ROL[etiqueta] != "rol"]
+    etiqueta = st.selectbox("Prioridad", etiquetas, key="prioridad_grafico_roles")
+    prioridad = PRIORIDADES_ROL[etiqueta]
+    st.subheader(f"Roles - {etiqueta.capitalize()}")
+    mostrar_figura("roles", artefactos, estado + (("prioridad", prioridad),),
+                   lambda: artefactos.get_roles_distribution(mascara, prioridad))
+
+@st.fragment
+def grafico_experiencia(artefactos, mascara, estado: tuple):
+    st.subheader("Nivel de Experiencia (1-5)")
+    orden_exp = ['1', '2', '3', '4', '5']
+    mostrar_figura("experiencia", artefactos, estado,
+                   lambda: artefactos.get_experiencia_distribution(mascara).reindex(orden_exp, fill_value=0))
+
+@st.fragment
+def grafico_edad(artefactos, mascara, estado: tuple):
+    st.subheader("Distribución de Edades")
+    mostrar_figura("edad", artefactos, estado, lambda: artefactos.get_edad_distribution(mascara))
+
+@st.fragment
+def grafico_motivacion(artefactos, mascara, estado: tuple):
+    st.subheader("Motivaciones")
+    mostrar_figura("motivacion", artefactos, estado, lambda: artefactos.get_motivacion_distribution(mascara))
+
+@st.fragment
+def grafico_compromiso(artefactos, mascara, estado: tuple):
+    st.subheader("Nivel de Compromiso")
+    mostrar_figura("compromiso", artefactos, estado, lambda: artefactos.get_compromiso_distribution(mascara))
+
+@st.fragment
+def grafico_skills(artefactos, mascara, estado: tuple):
+    st.subheader("Skills Técnicas Mencionadas")
+    skills_dist = artefactos.get_skills_distribution(mascara)
+    
+    if len(skills_dist) > 0:
+        top = st.slider("Top", min_value=5, max_value=15, value=15, key="top_grafico_skills")
+        mostrar_figura("skills", artefactos, estado + (("top", top),), lambda: skills_dist.head(top))
+    else:
+        st.info("No se encontraron skills técnicas mencionadas explícitamente")
+
+@st.fragment
+def seccion_insights(perfil: dict, portafolio_analysis: dict):
     st.header("Insights y Análisis")
     
-    perfil = processor.get_perfil_participantes()
-    portafolio_analysis = processor.get_portafolio_analysis()
-    
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -374,12 +293,11 @@ try:
         """, unsafe_allow_html=True)
         st.write(f"Total con portafolio: **{portafolio_analysis['total_con_portafolio']}** ({portafolio_analysis['porcentaje']:.1f}%)")
         st.markdown("</div>", unsafe_allow_html=True)
-    
-    st.markdown("---")
+
+@st.fragment
+def seccion_recomendaciones(recomendaciones: list):
     st.header("Recomendaciones Accionables")
     
-    recomendaciones = processor.generate_recommendations()
-    
     for rec in recomendaciones:
         tipo = rec['tipo']
         mensaje = rec['mensaje']
@@ -405,12 +323,65 @@ try:
                 <span>{mensaje}</span>
             </div>
             """, unsafe_allow_html=True)
+
+try:
+    artefactos = load_data(version_artefactos("data"))
+    insights = artefactos.insights
+    seleccion = filtros_sidebar(artefactos.filtros)
+    mascara = artefactos.mascara(seleccion)
+    estado = clave_filtros(seleccion)
+    if mascara is not None:
+        st.sidebar.caption(f"{artefactos.filtros.contar(mascara)} de {artefactos.filtros.filas} inscritos. "
+                           "Alertas, insights y recomendaciones usan todas las inscripciones.")
+    
+    seccion_resumen(artefactos.get_kpis(mascara))
+    
+    st.markdown("---")
+    
+    seccion_alertas(insights['alerts'])
+    
+    st.markdown("---")
+    
+    st.header("Análisis de Inscripciones")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        grafico_roles(artefactos, mascara, estado)
+    
+    with col2:
+        grafico_experiencia(artefactos, mascara, estado)
+    
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        grafico_edad(artefactos, mascara, estado)
+    
+    with col4:
+        grafico_motivacion(artefactos, mascara, estado)
+    
+    st.markdown("---")
+    
+    col5, col6 = st.columns(2)
+    
+    with col5:
+        grafico_compromiso(artefactos, mascara, estado)
+    
+    with col6:
+        grafico_skills(artefactos, mascara, estado)
+    
+    st.markdown("---")
+    
+    seccion_insights(insights['perfil'], insights['portafolio_analysis'])
+    
+    st.markdown("---")
+    seccion_recomendaciones(insights['recomendaciones'])
     
     st.markdown("---")
     st.caption("Dashboard con análisis de Llama 3.2")
 
-except FileNotFoundError:
-    st.error("No se encontró el archivo 'data/inscripciones.csv'. Verifica que el archivo exista.")
+except FileNotFoundError as e:
+    st.error(f"No se encontraron los datos procesados: {str(e)}. Ejecuta `python data_processor.py` para generarlos.")
 except Exception as e:
     st.error(f"Error al cargar los datos: {str(e)}")
     
@@ -0,0 +1,107 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import pandas as pd
+from agregados import AlmacenAgregados
+from filtros import IndiceFiltros
+from formato_procesado import ORDEN_CATEGORIAS, cargar_procesados
+
+ARCHIVOS = {
+    "procesados": "processed_data.parquet",
+    "insights": "insights.json",
+    "agregados": "agregados.json",
+}
+DIRECTORIO_SNAPSHOTS = "snapshots"
+PUNTERO_SNAPSHOT = "ACTUAL"
+
+
+def snapshot_vigente(directorio: str = "data") -> Optional[str]:
+    try:
+        with open(os.path.join(directorio, DIRECTORIO_SNAPSHOTS, PUNTERO_SNAPSHOT), 'r', encoding='utf-8') as f:
+            nombre = f.read().strip()
+    except OSError:
+        return None
+    return nombre or None
+
+
+def directorio_vigente(directorio: str = "data") -> str:
+    # El worker publica snapshots versionados; sin snapshot se usan los archivos sueltos en data/
+    nombre = snapshot_vigente(directorio)
+    if nombre is None:
+        return directorio
+    return os.path.join(directorio, DIRECTORIO_SNAPSHOTS, nombre)
+
+
+def _version_directorio(directorio: str) -> str:
+    partes = [directorio]
+    for nombre in ("procesados", "insights"):
+        estado = os.stat(os.path.join(directorio, ARCHIVOS[nombre]))
+        partes.append(f"{estado.st_mtime_ns}-{estado.st_size}")
+    return "_".join(partes)
+
+
+def version_artefactos(directorio: str = "data") -> str:
+    return _version_directorio(directorio_vigente(directorio))
+
+
+@dataclass(frozen=True)
+class Artefactos:
+    df: pd.DataFrame
+    insights: dict
+    agregados: Optional[AlmacenAgregados]
+    version: str
+    filtros: IndiceFiltros
+
+    def _distribucion(self, dimension: str, filtro: str, mascara: Optional[np.ndarray]) -> pd.Series:
+        # Sin filtros activos se usan los agregados precalculados; con filtros, el índice de bitmaps
+        if mascara is None and self.agregados is not None:
+            return self.agregados.distribucion(dimension)
+        return self.filtros.distribucion(filtro, mascara)
+
+    def mascara(self, seleccion: dict) -> Optional[np.ndarray]:
+        return self.filtros.mascara(seleccion)
+
+    def get_kpis(self, mascara: Optional[np.ndarray] = None) -> dict:
+        if mascara is None:
+            return self.insights['kpis']
+        return self.filtros.kpis(mascara)
+
+    def get_roles_distribution(self, mascara: Optional[np.ndarray] = None,
+                               prioridad: str = 'rol_1era_prioridad') -> pd.Series:
+        # Los agregados solo cubren la 1era prioridad; las otras salen siempre del índice
+        if prioridad != 'rol_1era_prioridad':
+            return self.filtros.distribucion(prioridad, mascara)
+        return self._distribucion("roles", prioridad, mascara)
+
+    def get_experiencia_distribution(self, mascara: Optional[np.ndarray] = None) -> pd.Series:
+        return self._distribucion("experiencia", 'experiencia', mascara)
+
+    def get_edad_distribution(self, mascara: Optional[np.ndarray] = None) -> pd.Series:
+        return self._distribucion("edad", 'edad', mascara).reindex(ORDEN_CATEGORIAS['grupo_edad'], fill_value=0)
+
+    def get_motivacion_distribution(self, mascara: Optional[np.ndarray] = None) -> pd.Series:
+        return self._distribucion("motivacion", 'motivacion', mascara)
+
+    def get_compromiso_distribution(self, mascara: Optional[np.ndarray] = None) -> pd.Series:
+        return self._distribucion("compromiso", 'compromiso', mascara).reindex(
+            ORDEN_CATEGORIAS['compromiso'], fill_value=0
+        )
+
+    def get_skills_distribution(self, mascara: Optional[np.ndarray] = None) -> pd.Series:
+        return self._distribucion("skills", 'skills', mascara).head(15)
+
+
+def cargar_artefactos(directorio: str = "data") -> Artefactos:
+    directorio = directorio_vigente(directorio)
+    version = _version_directorio(directorio)
+    df = cargar_procesados(os.path.join(directorio, ARCHIVOS["procesados"]))
+    with open(os.path.join(directorio, ARCHIVOS["insights"]), 'r', encoding='utf-8') as f:
+        insights = json.load(f)
+
+    agregados = AlmacenAgregados.cargar(os.path.join(directorio, ARCHIVOS["agregados"]))
+    if agregados is not None and agregados.filas != len(df):
+        agregados = None
+
+    return Artefactos(df=df, insights=insights, agregados=agregados, version=version, filtros=IndiceFiltros(df))
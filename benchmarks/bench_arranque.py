@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos pesados que una sesión que solo mira el dashboard no debería cargar
+PESADOS = ["ollama", "httpx", "llm_classifier", "data_processor", "plotly"]
+
+# Dashboards: primer render completo con AppTest (sin servidor). Demás entry points: el import del módulo
+PUNTOS_ENTRADA = {
+    "app.py": "dashboard",
+    "app_cloud.py": "dashboard",
+    "data_processor.py": "modulo",
+    "worker.py": "modulo",
+    "preprocess_data.py": "modulo",
+}
+
+MEDIR_DASHBOARD = """
+import json, sys, time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+listo = time.perf_counter()
+app = AppTest.from_file({ruta!r}, default_timeout=120)
+app.run()
+fin = time.perf_counter()
+print(json.dumps({{
+    "segundos": fin - inicio,
+    "import_streamlit": listo - inicio,
+    "render": fin - listo,
+    "errores": [e.message for e in app.exception] + [e.value for e in app.error],
+    "pesados": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+MEDIR_MODULO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+fin = time.perf_counter()
+print(json.dumps({{
+    "segundos": fin - inicio,
+    "errores": [],
+    "pesados": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def medir(entrada: str, tipo: str) -> dict:
+    # Cada medición en un intérprete nuevo: así se mide el arranque en frío de una instancia
+    if tipo == "dashboard":
+        codigo = MEDIR_DASHBOARD.format(ruta=os.path.join(RAIZ, entrada), pesados=PESADOS)
+    else:
+        codigo = MEDIR_MODULO.format(modulo=os.path.splitext(entrada)[0], pesados=PESADOS)
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": RAIZ}
+    )
+    if salida.returncode != 0:
+        return {"segundos": None, "errores": [salida.stderr.strip().splitlines()[-1]], "pesados": []}
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío de cada entry point")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--entradas", nargs="+", default=list(PUNTOS_ENTRADA))
+    parser.add_argument("--salida", default=None)
+    args = parser.parse_args()
+
+    resultados = {}
+    for entrada in args.entradas:
+        mediciones = [medir(entrada, PUNTOS_ENTRADA[entrada]) for _ in range(args.repeticiones)]
+        tiempos = [m["segundos"] for m in mediciones if m["segundos"] is not None]
+        resultados[entrada] = {
+            "mediana": statistics.median(tiempos) if tiempos else None,
+            "minimo": min(tiempos) if tiempos else None,
+            "pesados": mediciones[-1]["pesados"],
+            "errores": mediciones[-1]["errores"],
+        }
+        datos = resultados[entrada]
+        tiempo = f"{datos['mediana']:.3f}s" if datos["mediana"] is not None else "falló"
+        print(f"{entrada:<20} {tiempo:>8}  pesados: {', '.join(datos['pesados']) or '-'}"
+              f"{'  errores: ' + '; '.join(datos['errores']) if datos['errores'] else ''}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en {args.salida}")
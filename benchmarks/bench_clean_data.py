@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_processor import DataProcessor
+
+TEXTOS = [
+    "Quiero aprender a desarrollar videojuegos y conocer gente",
+    "Tengo experiencia con Unity y C#, participé en 2 jams",
+    "Soy estudiante de ingeniería de software",
+    None,
+]
+
+
+def generar_df(filas: int, semilla: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(semilla)
+    edad = rng.integers(15, 45, filas).astype(float)
+    edad[rng.random(filas) < 0.05] = np.nan
+    nivel = rng.integers(1, 6, filas).astype(float)
+    nivel[rng.random(filas) < 0.05] = np.nan
+    return pd.DataFrame({
+        'Edad': edad,
+        'nivel_experiencia': nivel,
+        'portafolio': np.where(rng.random(filas) < 0.5, "https://itch.io/perfil", None),
+        'motivacion': rng.choice(np.array(TEXTOS, dtype=object), filas),
+        'experiencia_juegos': rng.choice(np.array(TEXTOS, dtype=object), filas),
+        'experiencia_profesional': rng.choice(np.array(TEXTOS, dtype=object), filas),
+    })
+
+
+def limpiar_por_filas(df: pd.DataFrame) -> list:
+    df['Edad'] = pd.to_numeric(df['Edad'], errors='coerce')
+    df['nivel_experiencia'] = pd.to_numeric(df['nivel_experiencia'], errors='coerce')
+    df['tiene_portafolio'] = df['portafolio'].notna() & (df['portafolio'] != '')
+
+    def mapear_nivel(valor):
+        if pd.isna(valor):
+            return "No especificado"
+        elif valor in (1, 2, 3, 4, 5):
+            return str(int(valor))
+        return "No especificado"
+
+    def grupo_edad(edad):
+        if pd.isna(edad):
+            return "No especificado"
+        elif edad < 20:
+            return "< 20"
+        elif edad < 25:
+            return "20-24"
+        elif edad < 30:
+            return "25-29"
+        return "30+"
+
+    df['categoria_experiencia'] = df['nivel_experiencia'].apply(mapear_nivel)
+    df['grupo_edad'] = df['Edad'].apply(grupo_edad)
+    return [
+        f"{str(row['motivacion'])} {str(row['experiencia_juegos'])}"
+        for _, row in df.iterrows()
+    ]
+
+
+def limpiar_vectorizado(df: pd.DataFrame) -> list:
+    processor = DataProcessor.__new__(DataProcessor)
+    processor.df = df
+    processor._clean_data()
+    return (processor._como_texto('motivacion') + " " + processor._como_texto('experiencia_juegos')).tolist()
+
+
+def medir(funcion, df: pd.DataFrame) -> float:
+    inicio = time.perf_counter()
+    funcion(df.copy())
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de _clean_data y construcción de textos")
+    parser.add_argument("--filas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = generar_df(args.filas)
+    t_filas = medir(limpiar_por_filas, df)
+    t_vectorizado = medir(limpiar_vectorizado, df)
+
+    print(f"Filas: {args.filas}")
+    print(f"Por filas (apply/iterrows): {t_filas:.3f}s")
+    print(f"Vectorizado:                {t_vectorizado:.3f}s")
+    print(f"Aceleración:                {t_filas / t_vectorizado:.1f}x")
@@ -0,0 +1,57 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generador import generar_export
+from ollama_http_falso import ServidorOllamaFalso
+from ollama_pool import PoolOllama
+from llm_classifier import LlamaAnalyzer
+from preprocess_data import renombrar
+
+
+def medir(textos, servidores, limite: int, caido: bool = False) -> dict:
+    if caido:
+        servidores[0].caido = True
+    pool = PoolOllama([f"{s.url}={limite}" for s in servidores], tiempo_expulsion=60.0)
+    analyzer = LlamaAnalyzer(max_concurrencia=pool.capacidad, cliente=pool)
+
+    inicio = time.perf_counter()
+    resultados = analyzer.procesar_batch_con_cache(textos, "motivacion", cache={})
+    segundos = time.perf_counter() - inicio
+    servidores[0].caido = False
+    return {
+        "segundos": segundos,
+        "llamadas_por_segundo": len(textos) / segundos,
+        "vacios": sum(1 for r in resultados if not r),
+        "por_backend": {url: datos["atendidas"] for url, datos in pool.estadisticas().items()},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput de PoolOllama contra servidores Ollama falsos locales")
+    parser.add_argument("--filas", type=int, default=400)
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--backends", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--limite", type=int, default=2, help="Concurrencia por backend")
+    args = parser.parse_args()
+
+    columna = {v: k for k, v in renombrar.items()}['motivacion']
+    base = generar_export(args.filas, 42)[columna].fillna("").astype(str).tolist()
+
+    for cantidad in args.backends:
+        servidores = [ServidorOllamaFalso(latencia_s=args.latencia).iniciar() for _ in range(cantidad)]
+        try:
+            for caido in ([False, True] if cantidad > 1 else [False]):
+                # Textos únicos por escenario para que ninguna llamada salga de cache
+                textos = [f"{texto} #{cantidad}-{caido}-{i}" for i, texto in enumerate(base)]
+                datos = medir(textos, servidores, args.limite, caido)
+                etiqueta = f"{cantidad} backend(s){' con uno caído' if caido else ''}"
+                print(f"{etiqueta:<28} {datos['segundos']:7.2f}s  {datos['llamadas_por_segundo']:7.1f} llamadas/s  "
+                      f"vacíos: {datos['vacios']}  reparto: {list(datos['por_backend'].values())}")
+        finally:
+            for servidor in servidores:
+                servidor.detener()
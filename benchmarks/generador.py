@@ -0,0 +1,128 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocess_data import renombrar
+
+COLUMNAS_FILLOUT = {v: k for k, v in renombrar.items()}
+
+ROLES = [
+    "Programación", "Game design", "Ilustración y animación 2D", "Ilustración y animación 3D",
+    "Guión/Narrativa", "Producción / Project management", "Música y/o efectos de sonido"
+]
+INSTITUCIONES = [
+    "UNSA", "UCSM", "UTP", "UCSP", "Tecsup", "Independiente", None
+]
+NOMBRES = ["Ana", "Luis", "María", "José", "Lucía", "Diego", "Valeria", "Renato", "Camila", "Jorge"]
+APELLIDOS = ["Quispe", "Mamani", "Flores", "Huamán", "Rodríguez", "Gutiérrez", "Salas", "Zegarra"]
+
+MOTIVACIONES = [
+    "Quiero aprender a crear videojuegos y trabajar en equipo",
+    "Me apasionan los videojuegos desde pequeño y quiero hacer el mío",
+    "Busco conocer gente de la comunidad de desarrollo en Arequipa",
+    "Es un reto personal, quiero ponerme a prueba en 48 horas",
+    "Quiero sumar proyectos a mi portafolio para la industria",
+    "Me recomendaron el evento y me pareció interesante",
+]
+COMPLEMENTOS = [
+    "", " Además quiero mejorar mis habilidades de programación.",
+    " Nunca he participado en una jam y tengo mucha curiosidad.",
+    " El año pasado no pude asistir y esta vez no me lo quiero perder.",
+]
+EXPERIENCIAS = [
+    "Ninguna",
+    "No tengo experiencia todavía, pero he visto tutoriales.",
+    "He hecho un par de prototipos en {motor} siguiendo cursos.",
+    "Participé en {jams} jams, usando {motor} y {lenguaje}.",
+    "Trabajo profesionalmente hace 3 años con {motor}, tengo un juego publicado en Steam.",
+    "En la universidad hicimos un juego en {motor} para el curso de {curso}.",
+]
+PROFESIONALES = [
+    "Estudiante de ingeniería de sistemas en {institucion}.",
+    "Diseñador gráfico, uso {arte} a diario.",
+    "Desarrollador web, trabajo con {lenguaje} y Git.",
+    "Estudio animación digital y manejo {arte}.",
+    "",
+]
+MOTORES = ["Unity", "Godot", "Unreal Engine", "GameMaker", "RPG Maker", "Scratch"]
+LENGUAJES = ["C#", "Python", "C++", "JavaScript", "Java", "Lua"]
+ARTE = ["Blender", "Photoshop", "Krita", "Aseprite", "Illustrator"]
+CURSOS = ["programación", "diseño", "multimedia"]
+
+
+def _elegir(rng, opciones, filas):
+    return rng.choice(np.array(opciones, dtype=object), filas)
+
+
+def _rellenar(plantillas, rng, filas):
+    motor = _elegir(rng, MOTORES, filas)
+    lenguaje = _elegir(rng, LENGUAJES, filas)
+    arte = _elegir(rng, ARTE, filas)
+    curso = _elegir(rng, CURSOS, filas)
+    institucion = _elegir(rng, [i for i in INSTITUCIONES if i], filas)
+    jams = rng.integers(1, 6, filas)
+    return [
+        p.format(motor=m, lenguaje=l, arte=a, curso=c, institucion=i, jams=j)
+        for p, m, l, a, c, i, j in zip(
+            _elegir(rng, plantillas, filas), motor, lenguaje, arte, curso, institucion, jams
+        )
+    ]
+
+
+def generar_export(filas: int, semilla: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(semilla)
+    inicio = pd.Timestamp("2026-01-05 09:00") + pd.to_timedelta(rng.integers(0, 14 * 24 * 60, filas), unit="m")
+    actualizado = inicio + pd.to_timedelta(rng.integers(3, 40, filas), unit="m")
+    formato = "%a %b %d %Y %H:%M:%S GMT-0500 (Colombia Standard Time)"
+
+    roles = np.argsort(rng.random((filas, len(ROLES))), axis=1)[:, :3]
+    nombres = _elegir(rng, NOMBRES, filas)
+    apellidos = _elegir(rng, APELLIDOS, filas)
+    edad = rng.normal(23, 4, filas).round().clip(15, 50)
+    edad[rng.random(filas) < 0.03] = np.nan
+
+    df = pd.DataFrame({
+        'Submission ID': [f"sub{i:08d}" for i in range(filas)],
+        'Last updated': actualizado.strftime(formato),
+        'Submission started': inicio.strftime(formato),
+        'Status': "Finished",
+        'Current step': "Ending",
+        'Nombre(s)': nombres,
+        'Apellidos(s)': apellidos,
+        'Edad': edad,
+        'DNI/CE': rng.integers(10_000_000, 80_000_000, filas),
+        'Email': [f"{n.lower()}.{a.lower()}{i}@correo.pe" for i, (n, a) in enumerate(zip(nombres, apellidos))],
+        'Número de celular': rng.integers(51_900_000_000, 51_999_999_999, filas),
+        'Institución educativa o empresa': _elegir(rng, INSTITUCIONES, filas),
+        COLUMNAS_FILLOUT['motivacion']: [
+            m + c for m, c in zip(_elegir(rng, MOTIVACIONES, filas), _elegir(rng, COMPLEMENTOS, filas))
+        ],
+        COLUMNAS_FILLOUT['experiencia_juegos']: _rellenar(EXPERIENCIAS, rng, filas),
+        COLUMNAS_FILLOUT['nivel_experiencia']: rng.integers(1, 6, filas),
+        COLUMNAS_FILLOUT['experiencia_profesional']: _rellenar(PROFESIONALES, rng, filas),
+        COLUMNAS_FILLOUT['rol_1era_prioridad']: np.array(ROLES, dtype=object)[roles[:, 0]],
+        COLUMNAS_FILLOUT['rol_2nda_prioridad']: np.array(ROLES, dtype=object)[roles[:, 1]],
+        COLUMNAS_FILLOUT['rol_3era_prioridad']: np.array(ROLES, dtype=object)[roles[:, 2]],
+        COLUMNAS_FILLOUT['portafolio']: np.where(
+            rng.random(filas) < 0.5, [f"https://itch.io/perfil{i}" for i in range(filas)], None
+        ),
+        'Errors': None,
+        'Url': None,
+        'Network ID': None,
+    })
+    df[COLUMNAS_FILLOUT['experiencia_profesional']] = df[COLUMNAS_FILLOUT['experiencia_profesional']].replace("", None)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un export sintético con el formato de Fillout")
+    parser.add_argument("--filas", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="data/fillout_sintetico.csv")
+    args = parser.parse_args()
+
+    generar_export(args.filas, args.semilla).to_csv(args.salida, index=False)
+    print(f"Generadas {args.filas} inscripciones sintéticas en {args.salida}")
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_classifier import CATEGORIAS_MOTIVACION, NIVELES_COMPROMISO, NIVELES_EXPERIENCIA
+from skills_gazetteer import extraer_skills_serie
+
+import pandas as pd
+
+
+class OllamaFalso:
+
+    def __init__(self, latencia_s: float = 0.0, latencia_por_token_s: float = 0.0, tasa_invalidas: float = 0.0):
+        self.latencia_s = latencia_s
+        self.latencia_por_token_s = latencia_por_token_s
+        # Fracción de respuestas de experiencia que salen fuera del esquema (simula al modelo sin format)
+        self.tasa_invalidas = tasa_invalidas
+        self.llamadas = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _elegir(prompt: str, opciones: list, salto: int = 0):
+        indice = int(hashlib.md5(prompt.encode('utf-8')).hexdigest(), 16) + salto
+        return opciones[indice % len(opciones)]
+
+    def _responder(self, prompt: str) -> str:
+        lote = re.search(r'arreglo JSON de (\d+)', prompt)
+        if lote:
+            categorias = CATEGORIAS_MOTIVACION if "Categorías exactas" in prompt else NIVELES_COMPROMISO
+            return json.dumps([self._elegir(prompt, categorias, i) for i in range(int(lote.group(1)))])
+        if '"compromiso": una de' in prompt:
+            datos = {
+                "motivacion": self._elegir(prompt, CATEGORIAS_MOTIVACION),
+                "tiene_proyectos": self._elegir(prompt, [True, False]),
+                "jams_previas": self._elegir(prompt, [0, 0, 1, 2, 3]),
+                "nivel_real": self._elegir(prompt, NIVELES_EXPERIENCIA),
+                "compromiso": self._elegir(prompt, NIVELES_COMPROMISO),
+            }
+            if '"skills":' in prompt:
+                datos["skills"] = extraer_skills_serie(pd.Series([prompt]))[0]
+            return json.dumps(datos, ensure_ascii=False)
+        if "Clasifícala en UNA" in prompt:
+            return self._elegir(prompt, CATEGORIAS_MOTIVACION)
+        if '"nivel_real"' in prompt:
+            datos = {
+                "tiene_proyectos": self._elegir(prompt, [True, False]),
+                "jams_previas": self._elegir(prompt, [0, 0, 1, 2, 3]),
+                "nivel_real": self._elegir(prompt, NIVELES_EXPERIENCIA),
+            }
+            invalida = int(hashlib.md5(prompt.encode('utf-8')).hexdigest(), 16) % 1000 < self.tasa_invalidas * 1000
+            if invalida and "Errores encontrados" not in prompt:
+                datos["nivel_real"] = "Experto"
+                return "Claro, aquí está: " + json.dumps(datos)[:-1]
+            return json.dumps(datos)
+        if "Alto, Medio o Bajo" in prompt:
+            return self._elegir(prompt, NIVELES_COMPROMISO)
+        if "NINGUNA" in prompt:
+            skills = extraer_skills_serie(pd.Series([prompt.split("IMPORTANTE")[0]]))[0]
+            return ", ".join(skills) if skills else "NINGUNA"
+        return ""
+
+    def generate(self, model: str, prompt: str, options: dict = None, **kwargs) -> dict:
+        inicio = time.perf_counter()
+        respuesta = self._responder(prompt)
+        eval_count = max(1, len(respuesta) // 4)
+        limite = (options or {}).get("num_predict")
+        # Como Ollama: al llegar a num_predict la respuesta se corta y done_reason es "length"
+        truncada = limite is not None and eval_count > limite
+        if truncada:
+            respuesta, eval_count = respuesta[:limite * 4], limite
+        time.sleep(self.latencia_s + self.latencia_por_token_s * eval_count)
+        with self._lock:
+            self.llamadas += 1
+        return {
+            "model": model,
+            "response": respuesta,
+            "done": True,
+            "done_reason": "length" if truncada else "stop",
+            "prompt_eval_count": max(1, len(prompt) // 4),
+            "eval_count": eval_count,
+            "total_duration": int((time.perf_counter() - inicio) * 1e9),
+        }
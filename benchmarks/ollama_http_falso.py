@@ -0,0 +1,68 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ollama_falso import OllamaFalso
+
+
+class ServidorOllamaFalso:
+    # Servidor HTTP local que imita /api/generate y /api/tags de Ollama para probar PoolOllama
+
+    def __init__(self, latencia_s: float = 0.0, puerto: int = 0):
+        self.modelo = OllamaFalso(latencia_s=latencia_s)
+        self.caido = False
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, codigo: int, datos: dict):
+                cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+                self.send_response(codigo)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def do_GET(self):
+                if servidor.caido:
+                    self._responder(503, {"error": "servidor caído"})
+                elif self.path == "/api/tags":
+                    self._responder(200, {"models": [{"name": "llama3.2"}]})
+                else:
+                    self._responder(404, {"error": "no encontrado"})
+
+            def do_POST(self):
+                largo = int(self.headers.get("Content-Length", 0))
+                solicitud = json.loads(self.rfile.read(largo) or b"{}")
+                if servidor.caido:
+                    self._responder(503, {"error": "servidor caído"})
+                elif self.path == "/api/generate":
+                    self._responder(200, servidor.modelo.generate(
+                        model=solicitud.get("model", ""),
+                        prompt=solicitud.get("prompt", ""),
+                        options=solicitud.get("options"),
+                        format=solicitud.get("format"),
+                    ))
+                else:
+                    self._responder(404, {"error": "no encontrado"})
+
+        self._http = ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+        self._hilo = threading.Thread(target=self._http.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._http.server_address[1]}"
+
+    @property
+    def llamadas(self) -> int:
+        return self.modelo.llamadas
+
+    def iniciar(self) -> "ServidorOllamaFalso":
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._http.shutdown()
+        self._http.server_close()
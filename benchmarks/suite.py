@@ -0,0 +1,163 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from generador import generar_export
+from ollama_falso import OllamaFalso
+from data_processor import DataProcessor
+from artefactos import cargar_artefactos
+from preprocess_data import preprocesar
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def _medir(funcion, silencioso: bool = True):
+    salida = open(os.devnull, 'w') if silencioso else None
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(salida) if silencioso else contextlib.nullcontext():
+            resultado = funcion()
+    finally:
+        if salida:
+            salida.close()
+    return time.perf_counter() - inicio, resultado
+
+
+def correr_escenarios(filas: int, args) -> dict:
+    escenarios = {}
+    cliente = OllamaFalso(latencia_s=args.latencia)
+    opciones = {
+        "cliente_llm": cliente,
+        "max_concurrencia": args.concurrencia,
+        "tamano_lote": args.tamano_lote,
+        "modo_fusionado": args.fusionado,
+    }
+
+    with tempfile.TemporaryDirectory() as directorio:
+        anterior = os.getcwd()
+        os.chdir(directorio)
+        os.makedirs("data")
+        try:
+            generar_export(filas, args.semilla).to_csv("export.csv", index=False)
+
+            t, _ = _medir(lambda: preprocesar("export.csv", "data/inscripciones.csv"))
+            escenarios["preprocess"] = {"segundos": t}
+
+            df = pd.read_csv("data/inscripciones.csv")
+
+            def limpiar():
+                processor = DataProcessor.__new__(DataProcessor)
+                processor.df = df.copy()
+                processor._clean_data()
+            t, _ = _medir(limpiar)
+            escenarios["clean_data"] = {"segundos": t}
+
+            t, processor = _medir(lambda: DataProcessor("data/inscripciones.csv", **opciones))
+            escenarios["pipeline_frio"] = {"segundos": t, "llamadas_llm": cliente.llamadas}
+
+            llamadas = cliente.llamadas
+            t, _ = _medir(processor._process_text_fields)
+            escenarios["process_text_fields_caliente"] = {
+                "segundos": t, "llamadas_llm": cliente.llamadas - llamadas
+            }
+            processor.cerrar()
+
+            llamadas = cliente.llamadas
+            t, processor = _medir(lambda: DataProcessor("data/inscripciones.csv", **opciones))
+            escenarios["pipeline_caliente"] = {"segundos": t, "llamadas_llm": cliente.llamadas - llamadas}
+
+            # El pipeline ya memorizó los insights: se invalidan para medir el cálculo y no un acierto del memo
+            processor.motor_insights.invalidar()
+            t, _ = _medir(processor.generar_insights)
+            escenarios["insights"] = {"segundos": t}
+
+            def consultar():
+                # Aciertos del memo: cada get_* debe costar O(categorías), sin recorrer las filas
+                for _ in range(100):
+                    processor.get_kpis()
+                    processor.get_roles_distribution()
+                    processor.get_skills_distribution()
+                    processor.get_perfil_participantes()
+            t, _ = _medir(consultar)
+            escenarios["consultas_memo"] = {"segundos": t}
+            processor.cerrar()
+
+            t, artefactos = _medir(lambda: cargar_artefactos("data"))
+            escenarios["carga_dashboard"] = {"segundos": t}
+
+            def filtrar():
+                # Una combinación de filtros y todos los gráficos del dashboard bajo esa máscara
+                indice = artefactos.filtros
+                mascara = artefactos.mascara({
+                    "rol": indice.opciones("rol")[:2],
+                    "edad": ["20-24", "25-29"],
+                    "skills": indice.opciones("skills")[:3],
+                    "portafolio": ["Con portafolio"],
+                })
+                artefactos.get_kpis(mascara)
+                for distribucion in (artefactos.get_roles_distribution, artefactos.get_experiencia_distribution,
+                                     artefactos.get_edad_distribution, artefactos.get_motivacion_distribution,
+                                     artefactos.get_compromiso_distribution, artefactos.get_skills_distribution):
+                    distribucion(mascara)
+            t, _ = _medir(filtrar)
+            escenarios["filtros_dashboard"] = {"segundos": t}
+        finally:
+            os.chdir(anterior)
+
+    for escenario in escenarios.values():
+        escenario["filas_por_segundo"] = filas / escenario["segundos"] if escenario["segundos"] > 0 else None
+    return escenarios
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de extremo a extremo del pipeline de inscripciones")
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latencia simulada por llamada a Ollama (s)")
+    parser.add_argument("--concurrencia", type=int, default=1)
+    parser.add_argument("--tamano-lote", type=int, default=1)
+    parser.add_argument("--fusionado", action="store_true")
+    parser.add_argument("--salida", default=None)
+    args = parser.parse_args()
+
+    commit = _commit_actual()
+    reporte = {
+        "commit": commit,
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "configuracion": {k: v for k, v in vars(args).items() if k != "salida"},
+        "resultados": [],
+    }
+
+    for filas in args.filas:
+        print(f"Corriendo escenarios con {filas} filas...")
+        escenarios = correr_escenarios(filas, args)
+        for nombre, datos in escenarios.items():
+            print(f"  {nombre:<30} {datos['segundos']:8.3f}s")
+        reporte["resultados"].append({"filas": filas, "escenarios": escenarios})
+
+    salida = args.salida or os.path.join(RAIZ, "benchmarks", "resultados", f"{commit}.json")
+    os.makedirs(os.path.dirname(salida), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {salida}")
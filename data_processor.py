@@ -1,181 +1,504 @@
 import pandas as pd
 import numpy as np
+from formato_procesado import EscritorProcesados, cargar_procesados, copiar_sin_filas, guardar_procesados
 from llm_classifier import LlamaAnalyzer
+from llm_store import LLMResultStore
+from reglas import ClasificadorCascada
+from skills_gazetteer import combinar_skills, extraer_skills_df
+from insights import MotorInsights
+from agregados import AlmacenAgregados
+from deduplicacion import COLUMNAS_CLAVE, deduplicar
+from instrumentacion import Instrumentacion
+from preprocess_data import columnas_identidad, renombrar
+import argparse
 import json
 import os
+from typing import Iterable, Union
+
+# Nombres que tienen las columnas de identidad del export después de preprocess_data
+COLUMNAS_IDENTIDAD = [renombrar.get(columna, columna) for columna in columnas_identidad]
 
 class DataProcessor:
     
-    def __init__(self, csv_path: str, use_cache: bool = True):
-        self.df = pd.read_csv(csv_path)
-        self.analyzer = LlamaAnalyzer(model_name="llama3.2")
-        self.cache_file = "data/llm_cache.json"
-        self.cache = self._load_cache() if use_cache else {}
-        
-        print(f"\nCargados {len(self.df)} registros")
-        print("Limpiando datos...")
-        self._clean_data()
+    def __init__(self, csv_path: Union[str, Iterable[pd.DataFrame]], use_cache: bool = True, max_concurrencia: int = 1,
+                 modo_fusionado: bool = False, tamano_lote: int = 1, incremental: bool = False,
+                 usar_reglas: bool = False, enriquecer_skills_llm: bool = False, cliente_llm=None,
+                 directorio_salida: str = "data", umbral_similitud: float = None, barra_progreso: bool = False,
+                 deduplicar_inscripciones: bool = True, directorio_cache: str = None):
+        self.instrumentacion = Instrumentacion(barra_progreso)
+        self.motor_insights = MotorInsights(self._version_datos)
+        self._registrar_insights()
+        # csv_path también puede ser un iterable de chunks (preprocess_data.leer_export)
+        chunks = None if isinstance(csv_path, str) else csv_path
+        with self.instrumentacion.etapa("carga"):
+            self.df = pd.read_csv(csv_path, dtype=str) if chunks is None else pd.DataFrame()
+        self.processed_file = os.path.join(directorio_salida, "processed_data.parquet")
+        self.agregados_file = os.path.join(directorio_salida, "agregados.json")
+        self.insights_file = os.path.join(directorio_salida, "insights.json")
+        self.reporte_file = os.path.join(directorio_salida, "reporte_ejecucion.json")
+        self.agregados = None
+        # En modo chunks las filas procesadas quedan solo en processed_file; los agregados son la fuente
+        self.procesado_en_disco = False
+        # La cache de Llama puede vivir fuera del directorio de salida para compartirse entre corridas
+        directorio_cache = directorio_cache or directorio_salida
+        self.cache_file = os.path.join(directorio_cache, "llm_cache.json")
+        self.store_file = os.path.join(directorio_cache, "llm_cache.sqlite")
+        self.store = LLMResultStore(self.store_file) if use_cache else None
+        self.analyzer = LlamaAnalyzer(
+            model_name="llama3.2",
+            max_concurrencia=max_concurrencia,
+            tamano_lote=tamano_lote,
+            store=self.store,
+            cliente=cliente_llm,
+            umbral_similitud=umbral_similitud,
+            instrumentacion=self.instrumentacion
+        )
+        self.modo_fusionado = modo_fusionado
+        self.cascada = ClasificadorCascada(self.analyzer) if usar_reglas else None
+        self.enriquecer_skills_llm = enriquecer_skills_llm
+        self.deduplicar_inscripciones = deduplicar_inscripciones
+        self.estadisticas_dedup = {"filas": 0, "eliminadas": 0, "llamadas_evitadas": {}}
+        self.cache = self._load_cache()
         
-        print("Procesando respuestas con Llama 3.2...")
-        self._process_text_fields()
+        previo = None
+        if chunks is None:
+            print(f"\nCargados {len(self.df)} registros")
+            self.df = self._deduplicar(self.df).reset_index(drop=True)
+            self.df['_hash_fila'] = self._hash_filas(self.df, list(self.df.columns))
+            previo = self._load_processed_data() if incremental else None
         
-        if use_cache:
-            self._save_cache()
+        completo = False
+        try:
+            if chunks is not None:
+                self._procesar_chunks(chunks)
+            elif previo is not None:
+                self._procesar_incremental(previo)
+            else:
+                self._limpiar_y_clasificar()
+                self._fijar_agregados(AlmacenAgregados.desde_df(self.df))
+            completo = True
+        finally:
+            # Si la corrida se interrumpe, lo ya calculado queda guardado y la siguiente retoma desde ahí
+            if use_cache:
+                with self.instrumentacion.etapa("guardar_cache"):
+                    self._save_cache()
+                    if not completo:
+                        # El constructor falla: nadie recibe el processor para llamar a cerrar()
+                        self.store.close()
         
         self._save_processed_data()
+        self._save_reporte()
         print("Procesamiento completado\n")
     
+    def cerrar(self):
+        # La conexión al store sigue abierta para _process_text_fields y el analizador; quien crea el
+        # processor la cierra al terminar (un worker crea uno por trabajo)
+        if self.store is not None:
+            self.store.close()
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df
+    
+    @df.setter
+    def df(self, valor: pd.DataFrame):
+        self._df = valor
+        self.marcar_modificado()
+    
+    def marcar_modificado(self):
+        # Reasignar self.df ya cuenta como cambio; una edición in situ (processor.df.loc[...] = ...)
+        # debe llamar a este método para que los insights memorizados se recalculen
+        self._revision = getattr(self, '_revision', 0) + 1
+    
+    def _version_datos(self) -> tuple:
+        # Se consulta en cada get_*: debe costar O(1), sin recorrer las filas
+        return (self._revision, len(self._df), tuple(self._df.columns))
+    
+    def _procesar_chunks(self, chunks: Iterable[pd.DataFrame]):
+        # Cada chunk se limpia, clasifica y escribe apenas se lee: en memoria quedan solo el chunk actual,
+        # los agregados y las claves de deduplicación de las filas ya escritas
+        agregados = AlmacenAgregados()
+        claves = []
+        temporal = f"{self.processed_file}.tmp"
+        escritor = EscritorProcesados(temporal)
+        iterador = iter(chunks)
+        try:
+            while True:
+                with self.instrumentacion.etapa("carga"):
+                    chunk = next(iterador, None)
+                if chunk is None:
+                    break
+                self.df = self._deduplicar(chunk).reset_index(drop=True)
+                print(f"\nChunk {len(claves) + 1}: {len(self.df)} registros")
+                self.df['_hash_fila'] = self._hash_filas(self.df, list(self.df.columns))
+                self._limpiar_y_clasificar()
+                agregados.sumar(self.df)
+                with self.instrumentacion.etapa("guardar_procesados", filas=len(self.df)):
+                    escritor.escribir(self.df)
+                claves.append(self.df[[c for c in COLUMNAS_CLAVE if c in self.df.columns]])
+        finally:
+            escritor.cerrar()
+        print(f"\nCargados {escritor.filas} registros en {len(claves)} chunks")
+        
+        descartar = None
+        if self.deduplicar_inscripciones and len(claves) > 1:
+            # Un inscrito puede repetirse en chunks distintos: ya está clasificado, pero no debe contar dos veces
+            claves = pd.concat(claves, ignore_index=True)
+            descartar = np.ones(len(claves), dtype=bool)
+            descartar[self._deduplicar(claves, clasificadas=True).index] = False
+        with self.instrumentacion.etapa("guardar_procesados"):
+            if escritor.filas == 0:
+                guardar_procesados(self.df, self.processed_file)
+            elif descartar is not None and descartar.any():
+                agregados.restar(copiar_sin_filas(temporal, self.processed_file, descartar))
+                os.remove(temporal)
+            else:
+                os.replace(temporal, self.processed_file)
+        
+        self.procesado_en_disco = True
+        self.df = self.df.iloc[0:0]
+        self._fijar_agregados(agregados)
+    
+    def _deduplicar(self, df: pd.DataFrame, clasificadas: bool = False) -> pd.DataFrame:
+        if not self.deduplicar_inscripciones:
+            return df
+        with self.instrumentacion.etapa("deduplicacion", filas=len(df)):
+            unicos, stats = deduplicar(df)
+        self.estadisticas_dedup["eliminadas"] += stats["eliminadas"]
+        if clasificadas:
+            # Filas que ya pasaron por Llama: se descartan pero no ahorran llamadas
+            stats["llamadas_evitadas"] = {}
+        else:
+            self.estadisticas_dedup["filas"] += stats["filas"]
+        evitadas = self.estadisticas_dedup["llamadas_evitadas"]
+        for tarea, cantidad in stats["llamadas_evitadas"].items():
+            evitadas[tarea] = evitadas.get(tarea, 0) + cantidad
+        if stats["eliminadas"]:
+            print(f"Deduplicación: {stats['eliminadas']} inscripciones repetidas eliminadas, "
+                  f"{sum(stats['llamadas_evitadas'].values())} llamadas a Llama evitadas")
+        return unicos
+    
+    def _fijar_agregados(self, agregados: AlmacenAgregados, version: tuple = None):
+        if not self.procesado_en_disco and agregados.filas != len(self.df):
+            print("Agregados desalineados con los datos, se recalculan")
+            agregados = AlmacenAgregados.desde_df(self.df)
+        self.agregados = agregados
+        self._version_agregados = version or self._version_datos()
+    
+    def _agregados_actuales(self) -> AlmacenAgregados:
+        return self.motor_insights.obtener("agregados")
+    
+    def _calcular_agregados(self) -> AlmacenAgregados:
+        # Los agregados que fijó el pipeline valen mientras la versión de los datos sea la misma
+        version = self.motor_insights.version
+        if self.agregados is None or self._version_agregados != version:
+            self._fijar_agregados(AlmacenAgregados.desde_df(self.df), version)
+        return self.agregados
+    
+    def _registrar_insights(self):
+        motor = self.motor_insights
+        motor.registrar("agregados", self._calcular_agregados)
+        motor.registrar("roles", self._calcular_roles, ["agregados"])
+        motor.registrar("experiencia", self._calcular_experiencia, ["agregados"])
+        motor.registrar("edad", self._calcular_edad, ["agregados"])
+        motor.registrar("motivacion", self._calcular_motivacion, ["agregados"])
+        motor.registrar("compromiso", self._calcular_compromiso, ["agregados"])
+        motor.registrar("skills", self._calcular_skills, ["agregados"])
+        motor.registrar("kpis", self._calcular_kpis, ["agregados"])
+        motor.registrar("alerts", self._calcular_alerts, ["roles"])
+        motor.registrar("perfil", self._calcular_perfil, ["agregados", "skills"])
+        motor.registrar("portafolio_analysis", self._calcular_portafolio, ["agregados"])
+        motor.registrar("recomendaciones", self._calcular_recomendaciones, ["alerts", "perfil"])
+        motor.registrar(
+            "insights",
+            lambda kpis, perfil, portafolio, alerts, recomendaciones: {
+                "kpis": kpis,
+                "perfil": perfil,
+                "portafolio_analysis": portafolio,
+                "alerts": alerts,
+                "recomendaciones": recomendaciones
+            },
+            ["kpis", "perfil", "portafolio_analysis", "alerts", "recomendaciones"]
+        )
+    
     def _load_cache(self):
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-                    if all(key in cache for key in ['motivaciones', 'experiencias', 'compromisos', 'skills']):
-                        return cache
-            except:
-                pass
-        return {
+        cache = {
             "motivaciones": {},
             "experiencias": {},
             "compromisos": {},
             "skills": {}
         }
+        if self.store is not None and len(self.store) == 0 and os.path.exists(self.cache_file):
+            self._importar_cache_json()
+        return cache
+    
+    def _importar_cache_json(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                legado = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"No se pudo importar {self.cache_file}: {e}")
+            return
+        
+        tipos = {"motivaciones": "motivacion", "experiencias": "experiencia",
+                 "compromisos": "compromiso", "skills": "skills"}
+        total = 0
+        for nombre, tipo in tipos.items():
+            total += self.analyzer.importar_resultados(tipo, legado.get(nombre, {}))
+        self.store.commit()
+        print(f"Importados {total} resultados de {self.cache_file} a {self.store_file}")
     
     def _save_cache(self):
-        os.makedirs('data', exist_ok=True)
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        if self.store.sin_confirmar:
+            print(f"Guardando {self.store.sin_confirmar} resultados pendientes en {self.store_file}")
+        self.store.commit()
+    
+    @staticmethod
+    def _hash_filas(df: pd.DataFrame, columnas: list) -> np.ndarray:
+        # uint64 tal cual sale de pandas: reinterpretado como int64 el índice de .loc avisa overflow
+        return pd.util.hash_pandas_object(df[columnas], index=False).to_numpy()
+    
+    def _load_processed_data(self):
+        if not os.path.exists(self.processed_file):
+            return None
+        previo = cargar_procesados(self.processed_file)
+        if '_hash_fila' not in previo.columns:
+            print("Datos procesados sin hash de filas, se reprocesa todo")
+            return None
+        if previo['_hash_fila'].dtype == 'int64':
+            # Procesados de versiones que guardaban el hash como int64: mismos bits, se reinterpretan
+            previo['_hash_fila'] = previo['_hash_fila'].to_numpy().view('uint64')
+        return previo
+    
+    def _procesar_incremental(self, previo: pd.DataFrame):
+        nuevo = self.df
+        vigentes = previo[previo['_hash_fila'].isin(nuevo['_hash_fila'])].drop_duplicates('_hash_fila')
+        delta = nuevo[~nuevo['_hash_fila'].isin(vigentes['_hash_fila'])].drop_duplicates('_hash_fila')
+        
+        ids_previos = self._hash_filas(previo, COLUMNAS_IDENTIDAD)
+        ids_delta = self._hash_filas(delta, COLUMNAS_IDENTIDAD)
+        editados = int(np.isin(ids_delta, ids_previos).sum())
+        print(f"Modo incremental: {len(vigentes)} sin cambios, "
+              f"{len(delta) - editados} nuevos, {editados} editados")
+        
+        agregados = AlmacenAgregados.cargar(self.agregados_file)
+        if agregados is not None and agregados.filas == len(previo):
+            agregados.restar(previo[~previo['_hash_fila'].isin(nuevo['_hash_fila'])])
+        else:
+            agregados = None
+        
+        if len(delta) > 0:
+            self.df = delta.reset_index(drop=True)
+            self._limpiar_y_clasificar()
+            if agregados is not None:
+                agregados.sumar(self.df)
+            vigentes = pd.concat([vigentes, self.df], ignore_index=True)
+        
+        self.df = (
+            vigentes.set_index('_hash_fila')
+            .loc[nuevo['_hash_fila']]
+            .reset_index()[vigentes.columns]
+        )
+        self._fijar_agregados(agregados or AlmacenAgregados.desde_df(self.df))
     
     def _save_processed_data(self):
-        processed_file = "data/processed_data.csv"
-        self.df.to_csv(processed_file, index=False, encoding='utf-8')
-        print(f"Datos procesados guardados en {processed_file}")
-        
-        insights_file = "data/insights.json"
-        insights = {
-            "kpis": self.get_kpis(),
-            "perfil": self.get_perfil_participantes(),
-            "portafolio_analysis": self.get_portafolio_analysis(),
-            "alerts": self.get_deficit_alerts(),
-            "recomendaciones": self.generate_recommendations()
-        }
+        with self.instrumentacion.etapa("guardar_procesados", filas=len(self.df)):
+            if not self.procesado_en_disco:
+                guardar_procesados(self.df, self.processed_file)
+            print(f"Datos procesados guardados en {self.processed_file}")
+            
+            self._agregados_actuales().guardar(self.agregados_file)
         
-        with open(insights_file, 'w', encoding='utf-8') as f:
+        with self.instrumentacion.etapa("insights"):
+            insights = self.generar_insights()
+        
+        with open(self.insights_file, 'w', encoding='utf-8') as f:
             json.dump(insights, f, ensure_ascii=False, indent=2)
-        print(f"Insights guardados en {insights_file}")
+        print(f"Insights guardados en {self.insights_file}")
+    
+    def _save_reporte(self):
+        extra = {
+            "reuso": self.analyzer.estadisticas_reuso,
+            "insights": self.motor_insights.reporte_tiempos(),
+            "deduplicacion": self.estadisticas_dedup,
+        }
+        if self.cascada:
+            extra["cascada"] = self.cascada.estadisticas
+        reporte = self.instrumentacion.guardar(self.reporte_file, self._agregados_actuales().filas, extra)
+        print(self.instrumentacion.resumen(reporte))
+        print(f"Reporte de ejecución guardado en {self.reporte_file}")
+    
+    def generar_insights(self) -> dict:
+        return self.motor_insights.obtener("insights")
     
     def _clean_data(self):
         self.df['Edad'] = pd.to_numeric(self.df['Edad'], errors='coerce')
         self.df['nivel_experiencia'] = pd.to_numeric(self.df['nivel_experiencia'], errors='coerce')
         self.df['tiene_portafolio'] = self.df['portafolio'].notna() & (self.df['portafolio'] != '')
         
-        def mapear_nivel(valor):
-            if pd.isna(valor):
-                return "No especificado"
-            elif valor == 1:
-                return "1"
-            elif valor == 2:
-                return "2"
-            elif valor == 3:
-                return "3"
-            elif valor == 4:
-                return "4"
-            elif valor == 5:
-                return "5"
-            else:
-                return "No especificado"
-        
-        self.df['categoria_experiencia'] = self.df['nivel_experiencia'].apply(mapear_nivel)
-        
-        def grupo_edad(edad):
-            if pd.isna(edad):
-                return "No especificado"
-            elif edad < 20:
-                return "< 20"
-            elif edad < 25:
-                return "20-24"
-            elif edad < 30:
-                return "25-29"
-            else:
-                return "30+"
+        nivel = self.df['nivel_experiencia']
+        self.df['categoria_experiencia'] = np.where(
+            nivel.isin([1, 2, 3, 4, 5]),
+            nivel.fillna(0).astype(int).astype(str),
+            "No especificado"
+        )
+        
+        self.df['grupo_edad'] = (
+            pd.cut(
+                self.df['Edad'],
+                bins=[-np.inf, 20, 25, 30, np.inf],
+                labels=["< 20", "20-24", "25-29", "30+"],
+                right=False
+            )
+            .cat.add_categories("No especificado")
+            .fillna("No especificado")
+        )
+    
+    def _limpiar_y_clasificar(self):
+        print("Limpiando datos...")
+        with self.instrumentacion.etapa("limpieza", filas=len(self.df)):
+            self._clean_data()
         
-        self.df['grupo_edad'] = self.df['Edad'].apply(grupo_edad)
+        print("Procesando respuestas con Llama 3.2...")
+        self._process_text_fields()
+        # Las columnas clasificadas se asignan in situ sobre self.df
+        self.marcar_modificado()
+    
+    def _como_texto(self, columna: str) -> pd.Series:
+        return self.df[columna].astype(object).fillna("nan").astype(str)
     
     def _process_text_fields(self):
+        textos = {
+            "motivacion": self.df['motivacion'].fillna("").tolist(),
+            "experiencia": self.df['experiencia_juegos'].fillna("").tolist(),
+            "compromiso": (
+                self._como_texto('motivacion') + " " + self._como_texto('experiencia_juegos')
+            ).tolist(),
+            "skills": (
+                self._como_texto('experiencia_juegos') + " " + self._como_texto('experiencia_profesional')
+            ).tolist()
+        }
+        
+        caches = {
+            "motivacion": self.cache['motivaciones'],
+            "experiencia": self.cache['experiencias'],
+            "compromiso": self.cache['compromisos'],
+            "skills": self.cache['skills']
+        }
+        tipos = [tipo for tipo in textos if tipo != "skills" or self.enriquecer_skills_llm]
+        # Las reglas de la cascada se evalúan una sola vez y las comparten el modo fusionado y procesar()
+        reglas = {tipo: self.cascada.aplicar_reglas(textos[tipo], tipo) for tipo in tipos} if self.cascada else {}
+        
+        def procesar(tipo):
+            if self.cascada:
+                return self.cascada.procesar(textos[tipo], tipo, caches[tipo], reglas[tipo])
+            return self.analyzer.procesar_batch_con_cache(textos[tipo], tipo, caches[tipo])
+        
+        if self.modo_fusionado:
+            print("\nAnalizando respuestas en modo fusionado...")
+            resueltos = None
+            if self.cascada:
+                resueltos = {tipo: reglas[tipo]["confiable"].tolist() for tipo in tipos}
+            with self.instrumentacion.etapa("llm_fusionado", filas=len(self.df)):
+                self.analyzer.procesar_fusionado_con_cache(
+                    textos,
+                    self.df['experiencia_profesional'].fillna("").tolist(),
+                    caches,
+                    resueltos=resueltos,
+                    con_skills=self.enriquecer_skills_llm
+                )
+        
         print("\nAnalizando motivaciones...")
-        motivaciones = self.df['motivacion'].fillna("").tolist()
-        self.df['categoria_motivacion'] = self.analyzer.procesar_batch_con_cache(
-            motivaciones, "motivacion", self.cache['motivaciones']
-        )
+        with self.instrumentacion.etapa("llm_motivacion", filas=len(self.df)):
+            self.df['categoria_motivacion'] = procesar("motivacion")
         
         print("\nAnalizando experiencia en juegos...")
-        experiencias = self.df['experiencia_juegos'].fillna("").tolist()
-        exp_results = self.analyzer.procesar_batch_con_cache(
-            experiencias, "experiencia", self.cache['experiencias']
-        )
+        with self.instrumentacion.etapa("llm_experiencia", filas=len(self.df)):
+            exp_results = procesar("experiencia")
         
         self.df['tiene_proyectos'] = [r['tiene_proyectos'] for r in exp_results]
         self.df['jams_previas'] = [r['jams_previas'] for r in exp_results]
         self.df['nivel_experiencia_real'] = [r['nivel_real'] for r in exp_results]
         
         print("\nAnalizando nivel de compromiso...")
-        textos_compromiso = [
-            f"{str(row['motivacion'])} {str(row['experiencia_juegos'])}"
-            for _, row in self.df.iterrows()
-        ]
-        self.df['compromiso'] = self.analyzer.procesar_batch_con_cache(
-            textos_compromiso, "compromiso", self.cache['compromisos']
-        )
+        with self.instrumentacion.etapa("llm_compromiso", filas=len(self.df)):
+            self.df['compromiso'] = procesar("compromiso")
         
         print("\nExtrayendo skills técnicas...")
-        textos_skills = [
-            f"{str(row['experiencia_juegos'])} {str(row['experiencia_profesional'])}"
-            for _, row in self.df.iterrows()
-        ]
-        self.df['skills'] = self.analyzer.procesar_batch_con_cache(
-            textos_skills, "skills", self.cache['skills']
-        )
+        with self.instrumentacion.etapa("skills", filas=len(self.df)):
+            skills = extraer_skills_df(self.df)
+            if self.enriquecer_skills_llm:
+                skills_llm = procesar("skills")
+                skills = [combinar_skills(base, extra) for base, extra in zip(skills, skills_llm)]
+            self.df['skills'] = skills
+        
+        if self.cascada:
+            for tipo, stats in self.cascada.estadisticas.items():
+                print(f"Cascada {tipo}: {stats['reglas']} por reglas, {stats['llm']} por Llama")
+        for tipo, stats in self.analyzer.estadisticas_reuso.items():
+            if stats['normalizacion'] or stats['similitud']:
+                print(f"Llamadas evitadas en {tipo}: {stats['normalizacion']} por normalización, "
+                      f"{stats['similitud']} por similitud")
     
     def get_kpis(self) -> dict:
+        return self.motor_insights.obtener("kpis")
+    
+    def _calcular_kpis(self, agregados: AlmacenAgregados) -> dict:
+        edad_validas = agregados.totales['edad_validas']
         return {
-            "total_inscritos": int(len(self.df)),
-            "edad_promedio": float(self.df['Edad'].mean()),
-            "porcentaje_portafolio": float((self.df['tiene_portafolio'].sum() / len(self.df)) * 100)
+            "total_inscritos": int(agregados.filas),
+            "edad_promedio": float(agregados.sumas['edad'] / edad_validas) if edad_validas else float('nan'),
+            "porcentaje_portafolio": self._porcentaje(agregados.totales['portafolio'], agregados.filas)
         }
     
+    @staticmethod
+    def _porcentaje(cantidad: int, filas: int) -> float:
+        return float(cantidad / filas * 100) if filas else 0.0
+    
     def get_roles_distribution(self):
-        return self.df['rol_1era_prioridad'].value_counts()
+        return self.motor_insights.obtener("roles")
+    
+    def _calcular_roles(self, agregados: AlmacenAgregados):
+        return agregados.distribucion("roles")
     
     def get_experiencia_distribution(self):
-        return self.df['categoria_experiencia'].value_counts()
+        return self.motor_insights.obtener("experiencia")
+    
+    def _calcular_experiencia(self, agregados: AlmacenAgregados):
+        return agregados.distribucion("experiencia")
     
     def get_edad_distribution(self):
+        return self.motor_insights.obtener("edad")
+    
+    def _calcular_edad(self, agregados: AlmacenAgregados):
         orden = ["< 20", "20-24", "25-29", "30+", "No especificado"]
-        dist = self.df['grupo_edad'].value_counts()
+        dist = agregados.distribucion("edad")
         return dist.reindex(orden, fill_value=0)
     
     def get_motivacion_distribution(self):
-        return self.df['categoria_motivacion'].value_counts()
+        return self.motor_insights.obtener("motivacion")
+    
+    def _calcular_motivacion(self, agregados: AlmacenAgregados):
+        return agregados.distribucion("motivacion")
     
     def get_compromiso_distribution(self):
+        return self.motor_insights.obtener("compromiso")
+    
+    def _calcular_compromiso(self, agregados: AlmacenAgregados):
         orden = ["Alto", "Medio", "Bajo"]
-        dist = self.df['compromiso'].value_counts()
+        dist = agregados.distribucion("compromiso")
         return dist.reindex(orden, fill_value=0)
     
     def get_skills_distribution(self):
-        all_skills = []
-        for skills_list in self.df['skills']:
-            if isinstance(skills_list, list) and len(skills_list) > 0:
-                all_skills.extend(skills_list)
-        
-        if not all_skills:
-            return pd.Series(dtype=int)
-        
-        skills_series = pd.Series(all_skills)
-        return skills_series.value_counts().head(15)
+        return self.motor_insights.obtener("skills")
+    
+    def _calcular_skills(self, agregados: AlmacenAgregados):
+        return agregados.distribucion("skills").head(15)
     
     def get_deficit_alerts(self) -> list:
-        roles_counts = self.get_roles_distribution()
+        return self.motor_insights.obtener("alerts")
+    
+    def _calcular_alerts(self, roles_counts) -> list:
         alerts = []
         
         UMBRAL_CRITICO = 3
@@ -200,32 +523,41 @@ class DataProcessor:
         return alerts
     
     def get_perfil_participantes(self) -> dict:
-        skills_dist = self.get_skills_distribution()
+        return self.motor_insights.obtener("perfil")
+    
+    def _calcular_perfil(self, agregados: AlmacenAgregados, skills_dist) -> dict:
         top_skills = {str(k): int(v) for k, v in skills_dist.head(5).to_dict().items()} if len(skills_dist) > 0 else {}
         
+        filas = agregados.filas
+        principiantes = agregados.conteo("experiencia", "1") + agregados.conteo("experiencia", "2")
+        
         return {
-            "porcentaje_principiantes": float((self.df['categoria_experiencia'].isin(['1', '2'])).sum() / len(self.df) * 100),
-            "porcentaje_principiantes_real": float((self.df['nivel_experiencia_real'] == "Principiante").sum() / len(self.df) * 100),
-            "porcentaje_con_jams_previas": float((self.df['jams_previas'] > 0).sum() / len(self.df) * 100),
-            "promedio_jams": float(self.df['jams_previas'].mean()),
+            "porcentaje_principiantes": self._porcentaje(principiantes, filas),
+            "porcentaje_principiantes_real": self._porcentaje(agregados.conteo("nivel_real", "Principiante"), filas),
+            "porcentaje_con_jams_previas": self._porcentaje(agregados.totales['con_jams'], filas),
+            "promedio_jams": float(agregados.sumas['jams'] / filas) if filas else float('nan'),
             "top_skills": top_skills,
-            "motivacion_principal": str(self.df['categoria_motivacion'].mode()[0] if len(self.df['categoria_motivacion'].mode()) > 0 else "No especificado"),
-            "compromiso_alto": float((self.df['compromiso'] == "Alto").sum() / len(self.df) * 100),
-            "tiene_proyectos_pct": float((self.df['tiene_proyectos'] == True).sum() / len(self.df) * 100)
+            "motivacion_principal": agregados.moda("motivacion"),
+            "compromiso_alto": self._porcentaje(agregados.conteo("compromiso", "Alto"), filas),
+            "tiene_proyectos_pct": self._porcentaje(agregados.totales['tiene_proyectos'], filas)
         }
     
     def get_portafolio_analysis(self) -> dict:
-        con_portafolio = self.df[self.df['tiene_portafolio']]
+        return self.motor_insights.obtener("portafolio_analysis")
+    
+    def _calcular_portafolio(self, agregados: AlmacenAgregados) -> dict:
+        con_portafolio = agregados.totales['portafolio']
         
         return {
-            "total_con_portafolio": int(len(con_portafolio)),
-            "porcentaje": float((len(con_portafolio) / len(self.df)) * 100)
+            "total_con_portafolio": int(con_portafolio),
+            "porcentaje": self._porcentaje(con_portafolio, agregados.filas)
         }
     
     def generate_recommendations(self) -> list:
+        return self.motor_insights.obtener("recomendaciones")
+    
+    def _calcular_recomendaciones(self, alerts, perfil) -> list:
         recomendaciones = []
-        alerts = self.get_deficit_alerts()
-        perfil = self.get_perfil_participantes()
         
         if alerts:
             roles_criticos = [a['rol'] for a in alerts if a['nivel'] == 'CRÍTICO']
@@ -279,4 +611,49 @@ class DataProcessor:
                 "mensaje": f"Solo {perfil['compromiso_alto']:.0f}% muestran alto compromiso. Reforzar comunicación sobre expectativas."
             })
         
-        return recomendaciones
\ No newline at end of file
+        return recomendaciones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procesa las inscripciones y guarda los artefactos del dashboard")
+    parser.add_argument("entrada", nargs="?", default="data/inscripciones.csv")
+    parser.add_argument("--salida", default="data", help="Directorio de los artefactos")
+    parser.add_argument("--cache", default=None, help="Directorio de la cache de Llama (por defecto, el de salida)")
+    parser.add_argument("--sin-cache", action="store_true", help="No lee ni guarda resultados de Llama")
+    parser.add_argument("--incremental", action="store_true", help="Solo reprocesa filas nuevas o editadas")
+    parser.add_argument("--concurrencia", type=int, default=None,
+                        help="Llamadas simultáneas a Llama (por defecto 1, o la capacidad total del pool)")
+    parser.add_argument("--backends", metavar="URL[=N]", nargs="*", default=[],
+                        help="Servidores Ollama con su límite de concurrencia, p. ej. http://pc2:11434=4")
+    parser.add_argument("--tamano-lote", type=int, default=1)
+    parser.add_argument("--fusionado", action="store_true")
+    parser.add_argument("--reglas", action="store_true")
+    parser.add_argument("--skills-llm", action="store_true", help="Completa las skills del gazetteer con Llama")
+    parser.add_argument("--similitud", type=float, default=None, metavar="UMBRAL",
+                        help="Reutiliza la clasificación de respuestas casi idénticas (Jaccard de trigramas, p. ej. 0.8)")
+    parser.add_argument("--progreso", action="store_true", help="Barra de progreso en lugar de una línea por resultado")
+    parser.add_argument("--sin-deduplicar", action="store_true", help="Conserva las inscripciones repetidas")
+    args = parser.parse_args()
+
+    pool = None
+    if args.backends:
+        from ollama_pool import PoolOllama
+        pool = PoolOllama(args.backends)
+        pool.verificar_salud()
+    processor = DataProcessor(
+        args.entrada,
+        use_cache=not args.sin_cache,
+        max_concurrencia=args.concurrencia or (pool.capacidad if pool else 1),
+        modo_fusionado=args.fusionado,
+        tamano_lote=args.tamano_lote,
+        incremental=args.incremental,
+        usar_reglas=args.reglas,
+        enriquecer_skills_llm=args.skills_llm,
+        cliente_llm=pool,
+        directorio_salida=args.salida,
+        umbral_similitud=args.similitud,
+        barra_progreso=args.progreso,
+        deduplicar_inscripciones=not args.sin_deduplicar,
+        directorio_cache=args.cache,
+    )
+    processor.cerrar()
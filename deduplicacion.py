@@ -0,0 +1,224 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from llm_store import normalizar_texto
+from similitud import jaccard, shingles
+
+COLUMNA_FECHA = 'Last updated'
+COLUMNAS_NOMBRE = ['Nombre(s)', 'Apellidos(s)']
+UMBRAL_NOMBRE = 0.85
+# Solo el celular admite typos: dos DNI/CE distintos nunca son la misma persona
+CLAVES_TIPEO = ['Número de celular']
+
+# Valores de relleno que se repiten entre personas distintas y no identifican a nadie
+LARGO_MINIMO = {'DNI/CE': 8, 'Número de celular': 9}
+SECUENCIAS = ("01234567890", "09876543210")
+EMAILS_RELLENO = {
+    'no', 'ninguno', 'ninguna', 'notengo', 'sincorreo', 'noaplica', 'na', 'test', 'prueba', 'correo', 'email'
+}
+PATRON_EMAIL = r'^[^@]+@[^@]+\.[a-z]{2,}$'
+
+# Todo lo que lee deduplicar() salvo los textos de TEXTOS_LLM
+COLUMNAS_CLAVE = ['DNI/CE', 'Email', 'Número de celular', *COLUMNAS_NOMBRE, 'Edad', COLUMNA_FECHA]
+
+# Columnas que alimenta cada tarea de Llama en DataProcessor._process_text_fields
+TEXTOS_LLM = {
+    "motivacion": ['motivacion'],
+    "experiencia": ['experiencia_juegos'],
+    "compromiso": ['motivacion', 'experiencia_juegos'],
+    "skills": ['experiencia_juegos', 'experiencia_profesional'],
+}
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    # Los exports viejos traen DNI y celulares como float ("73363933.0")
+    return serie.astype(object).fillna("").astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+
+
+def _degenerada(serie: pd.Series, largo_minimo: int) -> pd.Series:
+    # Muy corta, un solo dígito repetido ("999999999", "0") o un tramo de una secuencia ("123456789")
+    tramos = {s[i:j] for s in SECUENCIAS for i in range(len(s)) for j in range(i + largo_minimo, len(s) + 1)}
+    repetido = serie.str.fullmatch("|".join(f"{digito}+" for digito in "0123456789"))
+    return (serie.str.len() < largo_minimo) | repetido | serie.isin(tramos)
+
+
+def normalizar_claves(df: pd.DataFrame) -> pd.DataFrame:
+    claves = pd.DataFrame(index=df.index)
+    if 'DNI/CE' in df:
+        dni = _texto(df['DNI/CE']).str.upper().str.replace(r'[^0-9A-Z]', '', regex=True)
+        # Exportado como número, un DNI que empieza en 0 pierde ese dígito
+        dni = dni.mask(dni.str.fullmatch(r'\d{7}'), "0" + dni)
+        claves['DNI/CE'] = dni.mask(_degenerada(dni, LARGO_MINIMO['DNI/CE']), "")
+    if 'Email' in df:
+        email = _texto(df['Email']).str.lower().str.replace(r'\s', '', regex=True)
+        relleno = ~email.str.match(PATRON_EMAIL) | email.str.split("@").str[0].isin(EMAILS_RELLENO)
+        claves['Email'] = email.mask(relleno, "")
+    if 'Número de celular' in df:
+        # Solo los últimos 9 dígitos: "+51 987 654 321" y "987654321" son el mismo celular
+        celular = _texto(df['Número de celular']).str.replace(r'\D', '', regex=True).str[-9:]
+        claves['Número de celular'] = celular.mask(_degenerada(celular, LARGO_MINIMO['Número de celular']), "")
+    return claves.replace("", None)
+
+
+def fechas_actualizacion(df: pd.DataFrame) -> pd.Series:
+    if COLUMNA_FECHA not in df:
+        return pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns, UTC]')
+    # Formato de Fillout: "Sun Jan 11 2026 15:05:00 GMT-0500 (Colombia Standard Time)"
+    texto = _texto(df[COLUMNA_FECHA]).str.replace(r'\s*\(.*\)$', '', regex=True)
+    return pd.to_datetime(texto, format="%a %b %d %Y %H:%M:%S GMT%z", errors='coerce', utc=True)
+
+
+class _Componentes:
+    # Union-find que nunca junta dos componentes con DNI/CE distintos: cada componente guarda el
+    # código de su DNI (-1 si ninguna de sus filas lo tiene)
+
+    def __init__(self, dni: np.ndarray):
+        self.padre = list(range(len(dni)))
+        self.dni = dni.tolist()
+
+    def raiz(self, x: int) -> int:
+        while self.padre[x] != x:
+            self.padre[x] = self.padre[self.padre[x]]
+            x = self.padre[x]
+        return x
+
+    def unir(self, a: int, b: int):
+        a, b = self.raiz(a), self.raiz(b)
+        if a == b or -1 not in (self.dni[a], self.dni[b]) and self.dni[a] != self.dni[b]:
+            return
+        a, b = min(a, b), max(a, b)
+        self.padre[b] = a
+        self.dni[a] = max(self.dni[a], self.dni[b])
+
+    def etiquetas(self) -> np.ndarray:
+        return np.array([self.raiz(x) for x in range(len(self.padre))])
+
+
+def _aristas(codigos: np.ndarray) -> List[Tuple[int, int]]:
+    # Filas consecutivas con el mismo código (-1 = vacío): una cadena por grupo basta para unirlas
+    filas = np.flatnonzero(codigos != -1)
+    orden = filas[np.argsort(codigos[filas], kind='stable')]
+    mismo = codigos[orden[1:]] == codigos[orden[:-1]]
+    return list(zip(orden[:-1][mismo].tolist(), orden[1:][mismo].tolist()))
+
+
+def _una_edicion(a, b) -> bool:
+    # Distancia de Levenshtein <= 1: un dígito o letra mal tipeado al reenviar el formulario
+    if not isinstance(a, str) or not isinstance(b, str) or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _normalizar(serie: pd.Series) -> np.ndarray:
+    # Los nombres se repiten mucho: se normaliza cada valor distinto una sola vez
+    codigos, unicos = pd.factorize(serie)
+    return np.array([normalizar_texto(valor) for valor in unicos], dtype=object)[codigos]
+
+
+def _variantes(valor: str) -> List[str]:
+    # El valor y cada borrado de un carácter: dos claves a distancia de Levenshtein <= 1 comparten alguno
+    return [valor] + [valor[:i] + valor[i + 1:] for i in range(len(valor))]
+
+
+def _pares_por_nombre(df: pd.DataFrame, claves: pd.DataFrame, nombre: np.ndarray,
+                      apellido: np.ndarray) -> List[Tuple[int, int]]:
+    tipeables = [columna for columna in CLAVES_TIPEO if columna in claves]
+    if not tipeables:
+        return []
+    edad = (_texto(df['Edad']) if 'Edad' in df else pd.Series("", index=df.index)).to_numpy()
+    # Bloqueo: mismo primer apellido, misma inicial del nombre y misma edad
+    primer_apellido = pd.Series(apellido).str.split(" ").str[0].fillna("")
+    inicial = pd.Series(nombre).str[:1]
+    bloque = pd.Series(pd.MultiIndex.from_arrays([primer_apellido, inicial, edad]).factorize()[0])
+    bloque[(primer_apellido == "") | (inicial == "")] = -1
+
+    # Candidatos por índice de borrados: filas del mismo bloque con un celular a un typo de distancia.
+    # El mismo celular ya se evaluó en agrupar_duplicados (con el nombre exacto), así que basta una fila por valor
+    candidatos = set()
+    for columna in tipeables:
+        tabla = pd.DataFrame({"bloque": bloque, "valor": claves[columna].to_numpy()})
+        tabla = tabla[(tabla["bloque"] != -1) & tabla["valor"].notna()].drop_duplicates(["bloque", "valor"])
+        tabla = tabla[tabla.duplicated("bloque", keep=False)]
+        tabla = tabla.rename_axis("fila").reset_index()
+        tabla["variante"] = tabla["valor"].map(_variantes)
+        tabla = tabla.explode("variante")
+        cruce = tabla.merge(tabla, on=["bloque", "variante"])
+        cruce = cruce[(cruce["fila_x"] < cruce["fila_y"]) & (cruce["valor_x"] != cruce["valor_y"])]
+        candidatos.update(zip(cruce["fila_x"], cruce["fila_y"], cruce["valor_x"], cruce["valor_y"]))
+
+    pares = set()
+    for a, b, x, y in candidatos:
+        if (a, b) in pares or not _una_edicion(x, y):
+            continue
+        # Un typo en el celular no basta (puede ser casualidad): además el nombre debe coincidir.
+        # El email no cuenta: ana.quispe1 y ana.quispe11 son personas distintas
+        if jaccard(shingles(f"{nombre[a]} {apellido[a]}"), shingles(f"{nombre[b]} {apellido[b]}")) >= UMBRAL_NOMBRE:
+            pares.add((a, b))
+    return sorted(pares)
+
+
+def agrupar_duplicados(df: pd.DataFrame, por_nombre: bool = True) -> np.ndarray:
+    claves = normalizar_claves(df)
+    # Índices hash por clave: cada valor normalizado se reduce a un código entero (-1 = vacío)
+    codigos = {columna: pd.factorize(claves[columna])[0] for columna in claves.columns}
+    vacio = np.full(len(df), -1)
+    componentes = _Componentes(codigos.get('DNI/CE', vacio))
+    # Las uniones más seguras primero: si después dos claves se contradicen, gana el DNI/CE ya unido
+    for a, b in _aristas(codigos.get('DNI/CE', vacio)) + _aristas(codigos.get('Email', vacio)):
+        componentes.unir(a, b)
+
+    if all(columna in df for columna in COLUMNAS_NOMBRE):
+        nombre = _normalizar(_texto(df[COLUMNAS_NOMBRE[0]]))
+        apellido = _normalizar(_texto(df[COLUMNAS_NOMBRE[1]]))
+        # Un celular compartido solo une si también coincide el nombre: familias y amigos inscriben
+        # a varias personas con el mismo número
+        completo = pd.Series(nombre) + " " + pd.Series(apellido)
+        celular = codigos.get('Número de celular', vacio)
+        por_celular = pd.MultiIndex.from_arrays([celular, completo]).factorize()[0]
+        por_celular[(celular == -1) | (nombre == "") | (apellido == "")] = -1
+        pares = _aristas(por_celular)
+        if por_nombre:
+            pares += _pares_por_nombre(df, claves, nombre, apellido)
+        for a, b in pares:
+            componentes.unir(a, b)
+    return componentes.etiquetas()
+
+
+def llamadas_evitadas(conservadas: pd.DataFrame, eliminadas: pd.DataFrame) -> Dict[str, int]:
+    # Textos de las filas eliminadas que no aparecen en las conservadas: la cache no los habría cubierto
+    evitadas = {}
+    for tarea, columnas in TEXTOS_LLM.items():
+        if not all(columna in conservadas for columna in columnas):
+            continue
+        previas = pd.util.hash_pandas_object(conservadas[columnas], index=False)
+        nuevas = pd.util.hash_pandas_object(eliminadas[columnas], index=False)
+        evitadas[tarea] = int(nuevas[~nuevas.isin(previas)].nunique())
+    return evitadas
+
+
+def deduplicar(df: pd.DataFrame, por_nombre: bool = True) -> Tuple[pd.DataFrame, dict]:
+    if df.empty:
+        return df, {"filas": 0, "eliminadas": 0, "llamadas_evitadas": {}}
+    etiquetas = agrupar_duplicados(df, por_nombre)
+    fechas = fechas_actualizacion(df)
+
+    # Se conserva la última actualización de cada inscrito; sin fecha, la que aparece más abajo
+    orden = pd.DataFrame({"grupo": etiquetas, "fecha": fechas.to_numpy(), "posicion": np.arange(len(df))})
+    orden = orden.sort_values(["fecha", "posicion"], na_position='first', kind='stable')
+    conservar = np.zeros(len(df), dtype=bool)
+    conservar[orden.drop_duplicates("grupo", keep='last')["posicion"].to_numpy()] = True
+
+    # Se mantiene el índice original para que el llamador pueda ubicar las filas eliminadas
+    conservadas, eliminadas = df[conservar], df[~conservar]
+    return conservadas, {
+        "filas": len(df),
+        "eliminadas": len(eliminadas),
+        "llamadas_evitadas": llamadas_evitadas(conservadas, eliminadas),
+    }
@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from formato_procesado import ORDEN_CATEGORIAS
+
+COLUMNAS_ROL = ['rol_1era_prioridad', 'rol_2nda_prioridad', 'rol_3era_prioridad']
+
+# Filtro del sidebar -> columna del procesado; "rol" es cualquiera de las tres prioridades
+FILTROS = {
+    "rol": None,
+    "rol_1era_prioridad": 'rol_1era_prioridad',
+    "rol_2nda_prioridad": 'rol_2nda_prioridad',
+    "rol_3era_prioridad": 'rol_3era_prioridad',
+    "edad": 'grupo_edad',
+    "experiencia": 'categoria_experiencia',
+    "compromiso": 'compromiso',
+    "motivacion": 'categoria_motivacion',
+    "skills": 'skills',
+    "portafolio": 'tiene_portafolio',
+}
+PORTAFOLIO = {True: "Con portafolio", False: "Sin portafolio"}
+
+# Etiquetas del sidebar de los dashboards
+PRIORIDADES_ROL = {
+    "Cualquier prioridad": "rol",
+    "1era prioridad": "rol_1era_prioridad",
+    "2nda prioridad": "rol_2nda_prioridad",
+    "3era prioridad": "rol_3era_prioridad",
+}
+ETIQUETAS_FILTROS = {
+    "edad": "Grupo de edad",
+    "experiencia": "Nivel de experiencia",
+    "compromiso": "Compromiso",
+    "motivacion": "Motivación",
+    "skills": "Skill",
+    "portafolio": "Portafolio",
+}
+
+
+def clave_filtros(seleccion: Dict[str, List[str]]) -> tuple:
+    # Estado de filtros hashable y estable, para usarlo como clave de cache de figuras
+    return tuple(sorted((nombre, tuple(sorted(valores))) for nombre, valores in seleccion.items() if valores))
+
+
+class Dimension:
+    # Códigos por fila (o pares fila/código para skills) y un bitmap empaquetado por categoría
+
+    def __init__(self, categorias: List[str], filas: np.ndarray, codigos: np.ndarray, total: int):
+        self.categorias = categorias
+        self.filas = filas
+        self.codigos = codigos
+        self.bitmaps = {}
+        orden = np.argsort(codigos, kind='stable')
+        limites = np.searchsorted(codigos[orden], np.arange(len(categorias) + 1))
+        for codigo, categoria in enumerate(categorias):
+            mascara = np.zeros(total, dtype=bool)
+            mascara[filas[orden[limites[codigo]:limites[codigo + 1]]]] = True
+            self.bitmaps[categoria] = np.packbits(mascara)
+
+    def conteos(self, mascara: Optional[np.ndarray]) -> np.ndarray:
+        codigos = self.codigos if mascara is None else self.codigos[mascara[self.filas]]
+        return np.bincount(codigos, minlength=len(self.categorias))
+
+
+class IndiceFiltros:
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.reset_index(drop=True)
+        self.filas = len(df)
+        self.dimensiones: Dict[str, Dimension] = {}
+        for nombre, columna in FILTROS.items():
+            if columna is None or columna not in df.columns:
+                continue
+            serie = df[columna]
+            if nombre == "portafolio":
+                serie = serie.fillna(False).astype(bool).map(PORTAFOLIO)
+            elif nombre == "skills":
+                serie = serie.explode()
+            self.dimensiones[nombre] = self._dimension(serie, ORDEN_CATEGORIAS.get(columna))
+
+        roles = [self.dimensiones[c] for c in COLUMNAS_ROL if c in self.dimensiones]
+        if roles:
+            self.dimensiones["rol"] = self._union(roles)
+
+        self.edad = pd.to_numeric(df['Edad'], errors='coerce').to_numpy(dtype=float) if 'Edad' in df else None
+        self.portafolio = df['tiene_portafolio'].fillna(False).to_numpy(dtype=bool) if 'tiene_portafolio' in df else None
+
+    def _dimension(self, serie: pd.Series, orden: Optional[List[str]]) -> Dimension:
+        # El índice de la serie es la posición de la fila (repetida en skills, que es una lista)
+        serie = serie.dropna().astype(str)
+        presentes = set(serie.unique())
+        categorias = [c for c in (orden or []) if c in presentes]
+        categorias += sorted(presentes - set(categorias))
+        codigos = pd.Categorical(serie, categories=categorias).codes.astype(np.int32)
+        return Dimension(categorias, serie.index.to_numpy(), codigos, self.filas)
+
+    def _union(self, dimensiones: List[Dimension]) -> Dimension:
+        categorias = sorted(set().union(*(d.categorias for d in dimensiones)))
+        posicion = {categoria: i for i, categoria in enumerate(categorias)}
+        filas = np.concatenate([d.filas for d in dimensiones])
+        codigos = np.concatenate([
+            np.array([posicion[c] for c in d.categorias], dtype=np.int32)[d.codigos] for d in dimensiones
+        ])
+        return Dimension(categorias, filas, codigos, self.filas)
+
+    def opciones(self, nombre: str) -> List[str]:
+        dimension = self.dimensiones.get(nombre)
+        return list(dimension.categorias) if dimension else []
+
+    def mascara(self, seleccion: Dict[str, List[str]]) -> Optional[np.ndarray]:
+        # OR entre valores de un mismo filtro, AND entre filtros; None si no hay nada seleccionado
+        bitmap = None
+        for nombre, valores in seleccion.items():
+            dimension = self.dimensiones.get(nombre)
+            if not valores or dimension is None:
+                continue
+            union = np.zeros((self.filas + 7) // 8, dtype=np.uint8)
+            for valor in valores:
+                if valor in dimension.bitmaps:
+                    np.bitwise_or(union, dimension.bitmaps[valor], out=union)
+            bitmap = union if bitmap is None else np.bitwise_and(bitmap, union, out=bitmap)
+        if bitmap is None:
+            return None
+        return np.unpackbits(bitmap, count=self.filas).view(bool)
+
+    def contar(self, mascara: Optional[np.ndarray]) -> int:
+        return self.filas if mascara is None else int(np.count_nonzero(mascara))
+
+    def distribucion(self, nombre: str, mascara: Optional[np.ndarray] = None) -> pd.Series:
+        dimension = self.dimensiones.get(nombre)
+        if dimension is None:
+            return pd.Series(dtype='int64')
+        conteos = pd.Series(dimension.conteos(mascara), index=dimension.categorias, dtype='int64')
+        conteos = conteos[conteos > 0]
+        # Mismo orden que AlmacenAgregados.distribucion: cantidad descendente, luego nombre
+        return conteos.iloc[np.lexsort((conteos.index.to_numpy(), -conteos.to_numpy()))]
+
+    def kpis(self, mascara: Optional[np.ndarray] = None) -> dict:
+        # Sin columna Edad o tiene_portafolio (procesados viejos) el KPI queda vacío en vez de fallar
+        total = self.contar(mascara)
+        edad = self.edad if self.edad is not None else np.full(self.filas, np.nan)
+        portafolio = self.portafolio if self.portafolio is not None else np.zeros(self.filas, dtype=bool)
+        if mascara is not None:
+            edad, portafolio = edad[mascara], portafolio[mascara]
+        return {
+            "total_inscritos": total,
+            "edad_promedio": float(np.nanmean(edad)) if np.isfinite(edad).any() else float('nan'),
+            "porcentaje_portafolio": float(portafolio.sum() / total * 100) if total else 0.0,
+        }
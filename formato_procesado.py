@@ -0,0 +1,101 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+ORDEN_CATEGORIAS = {
+    'grupo_edad': ["< 20", "20-24", "25-29", "30+", "No especificado"],
+    'categoria_experiencia': ["1", "2", "3", "4", "5", "No especificado"],
+    'compromiso': ["Alto", "Medio", "Bajo"],
+    'nivel_experiencia_real': ["Principiante", "Intermedio", "Avanzado"],
+    'categoria_motivacion': [],
+    'rol_1era_prioridad': [],
+    'rol_2nda_prioridad': [],
+    'rol_3era_prioridad': [],
+}
+COLUMNAS_BOOLEANAS = ['tiene_portafolio', 'tiene_proyectos']
+TIPO_SKILLS = pa.list_(pa.string())
+
+
+def tipar_columnas(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for columna, orden in ORDEN_CATEGORIAS.items():
+        if columna not in df.columns:
+            continue
+        valores = df[columna].astype("string")
+        extras = sorted(v for v in valores.dropna().unique() if v not in orden)
+        df[columna] = pd.Categorical(valores, categories=orden + extras)
+
+    for columna in COLUMNAS_BOOLEANAS:
+        if columna in df.columns:
+            df[columna] = df[columna].fillna(False).astype(bool)
+
+    if 'jams_previas' in df.columns:
+        df['jams_previas'] = pd.to_numeric(df['jams_previas'], errors='coerce').fillna(0).astype('int64')
+
+    if 'skills' in df.columns:
+        df['skills'] = [list(s) if s is not None and not isinstance(s, float) else [] for s in df['skills']]
+    return df
+
+
+def _tabla(df: pd.DataFrame) -> pa.Table:
+    df = tipar_columnas(df)
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    if 'skills' in df.columns:
+        # Tipo explícito: sin skills en ninguna fila pyarrow inferiría list<null>
+        tabla = tabla.set_column(
+            tabla.schema.get_field_index('skills'), 'skills',
+            pa.array(df['skills'].tolist(), type=TIPO_SKILLS)
+        )
+    return tabla
+
+
+def guardar_procesados(df: pd.DataFrame, ruta: str):
+    pq.write_table(_tabla(df), ruta)
+
+
+class EscritorProcesados:
+    # Escribe el procesado por partes, un row group por chunk, con el esquema del primero
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.filas = 0
+        self._escritor = None
+
+    def escribir(self, df: pd.DataFrame):
+        tabla = _tabla(df)
+        if self._escritor is None:
+            # Una columna vacía en el primer chunk se infiere como null: se fija como texto para los siguientes
+            esquema = pa.schema(
+                [campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo for campo in tabla.schema],
+                metadata=tabla.schema.metadata
+            )
+            self._escritor = pq.ParquetWriter(self.ruta, esquema)
+        self._escritor.write_table(tabla.cast(self._escritor.schema))
+        self.filas += len(df)
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+def copiar_sin_filas(origen: str, destino: str, descartar) -> pd.DataFrame:
+    # Copia el procesado un row group a la vez omitiendo las posiciones marcadas en descartar;
+    # devuelve las filas omitidas
+    archivo = pq.ParquetFile(origen)
+    omitidas = []
+    inicio = 0
+    with pq.ParquetWriter(destino, archivo.schema_arrow) as escritor:
+        for i in range(archivo.num_row_groups):
+            tabla = archivo.read_row_group(i)
+            mascara = pa.array(descartar[inicio:inicio + len(tabla)])
+            inicio += len(tabla)
+            escritor.write_table(tabla.filter(pc.invert(mascara)))
+            omitidas.append(tabla.filter(mascara))
+    return pa.concat_tables(omitidas).to_pandas()
+
+
+def cargar_procesados(ruta: str) -> pd.DataFrame:
+    return pq.read_table(ruta).to_pandas(
+        types_mapper=lambda tipo: pd.ArrowDtype(tipo) if pa.types.is_list(tipo) else None
+    )
@@ -0,0 +1,91 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+FONDO_TRANSPARENTE = dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+COLORES_COMPROMISO = {'Alto': '#10b981', 'Medio': '#f59e0b', 'Bajo': '#ef4444'}
+
+
+def figura_roles(roles_dist: pd.Series) -> go.Figure:
+    colors = ['#ef4444' if v <= 3 else '#f59e0b' if v <= 5 else '#10b981'
+              for v in roles_dist.values]
+
+    fig = go.Figure(go.Bar(
+        x=roles_dist.values,
+        y=roles_dist.index,
+        orientation='h',
+        marker_color=colors,
+        text=roles_dist.values,
+        textposition='outside'
+    ))
+    fig.update_layout(showlegend=False, height=400, xaxis_title="Cantidad", yaxis_title="", **FONDO_TRANSPARENTE)
+    return fig
+
+
+def figura_experiencia(exp_ordenado: pd.Series) -> go.Figure:
+    fig = px.bar(
+        x=exp_ordenado.index,
+        y=exp_ordenado.values,
+        labels={'x': 'Nivel', 'y': 'Cantidad'},
+        color=exp_ordenado.values,
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(height=400, showlegend=False, **FONDO_TRANSPARENTE)
+    return fig
+
+
+def figura_edad(edad_dist: pd.Series) -> go.Figure:
+    fig = px.bar(
+        x=edad_dist.index,
+        y=edad_dist.values,
+        labels={'x': 'Grupo de Edad', 'y': 'Cantidad'},
+        color=edad_dist.values,
+        color_continuous_scale='Blues'
+    )
+    fig.update_layout(showlegend=False, height=400, **FONDO_TRANSPARENTE)
+    return fig
+
+
+def figura_motivacion(motiv_dist: pd.Series) -> go.Figure:
+    fig = px.pie(
+        values=motiv_dist.values,
+        names=motiv_dist.index,
+        color_discrete_sequence=px.colors.sequential.Greens_r
+    )
+    fig.update_layout(height=400, **FONDO_TRANSPARENTE)
+    return fig
+
+
+def figura_compromiso(comp_dist: pd.Series) -> go.Figure:
+    fig = go.Figure(go.Bar(
+        x=comp_dist.index,
+        y=comp_dist.values,
+        marker_color=[COLORES_COMPROMISO.get(x, '#95a5a6') for x in comp_dist.index],
+        text=comp_dist.values,
+        textposition='outside'
+    ))
+    fig.update_layout(showlegend=False, height=400, xaxis_title="", yaxis_title="Cantidad", **FONDO_TRANSPARENTE)
+    return fig
+
+
+def figura_skills(skills_dist: pd.Series) -> go.Figure:
+    fig = px.bar(
+        x=skills_dist.values,
+        y=skills_dist.index,
+        orientation='h',
+        labels={'x': 'Menciones', 'y': ''},
+        color=skills_dist.values,
+        color_continuous_scale='Oranges'
+    )
+    fig.update_layout(showlegend=False, height=400, **FONDO_TRANSPARENTE)
+    return fig
+
+
+CONSTRUCTORES = {
+    "roles": figura_roles,
+    "experiencia": figura_experiencia,
+    "edad": figura_edad,
+    "motivacion": figura_motivacion,
+    "compromiso": figura_compromiso,
+    "skills": figura_skills,
+}
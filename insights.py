@@ -0,0 +1,47 @@
+import time
+from typing import Callable, Dict, List
+
+
+class MotorInsights:
+
+    def __init__(self, version_datos: Callable[[], tuple]):
+        self.version_datos = version_datos
+        self._nodos: Dict[str, tuple] = {}
+        self._valores: Dict[str, any] = {}
+        self._version = None
+        self.tiempos: Dict[str, float] = {}
+
+    def registrar(self, nombre: str, funcion: Callable, dependencias: List[str] = ()):
+        for dependencia in dependencias:
+            if dependencia not in self._nodos:
+                raise ValueError(f"El nodo '{nombre}' depende de '{dependencia}', que no está registrado")
+        self._nodos[nombre] = (funcion, tuple(dependencias))
+        self._valores.pop(nombre, None)
+
+    def invalidar(self):
+        self._valores.clear()
+        self.tiempos.clear()
+
+    @property
+    def version(self):
+        return self._version
+
+    def obtener(self, nombre: str):
+        # La versión de los datos se calcula una vez por consulta, no en cada nodo del grafo
+        version = self.version_datos()
+        if version != self._version:
+            self.invalidar()
+            self._version = version
+        return self._resolver(nombre)
+
+    def _resolver(self, nombre: str):
+        if nombre not in self._valores:
+            funcion, dependencias = self._nodos[nombre]
+            argumentos = [self._resolver(dependencia) for dependencia in dependencias]
+            inicio = time.perf_counter()
+            self._valores[nombre] = funcion(*argumentos)
+            self.tiempos[nombre] = time.perf_counter() - inicio
+        return self._valores[nombre]
+
+    def reporte_tiempos(self) -> Dict[str, float]:
+        return dict(sorted(self.tiempos.items(), key=lambda item: item[1], reverse=True))
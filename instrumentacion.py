@@ -0,0 +1,198 @@
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+
+# Límites superiores (s) de las cubetas del histograma de latencia por llamada a Llama
+CUBETAS_LATENCIA = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+# Resultados de validación distintos de "valida", tal como se muestran en el resumen
+DESCRIPCION_VALIDACION = {
+    "reparada": "reparadas",
+    "heuristica": "por heurísticas",
+    "sin_etiqueta": "sin etiqueta reconocible",
+}
+
+
+def histograma(latencias: List[float]) -> dict:
+    if not latencias:
+        return {}
+    valores = np.asarray(latencias)
+    limites = CUBETAS_LATENCIA + [np.inf]
+    conteos, _ = np.histogram(valores, bins=[0] + limites)
+    p50, p90, p99 = np.percentile(valores, [50, 90, 99])
+    return {
+        "media": float(valores.mean()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(valores.max()),
+        "cubetas": {
+            (f"<= {limite}s" if np.isfinite(limite) else f"> {CUBETAS_LATENCIA[-1]}s"): int(conteo)
+            for limite, conteo in zip(limites, conteos)
+        },
+    }
+
+
+class Progreso:
+
+    def __init__(self, etiqueta: str, total: int, barra: bool = False, ancho: int = 30):
+        self.etiqueta = etiqueta
+        self.total = total
+        self.barra = barra
+        self.ancho = ancho
+        self.hechos = 0
+        self._inicio = time.perf_counter()
+        self._ultimo_dibujo = 0.0
+
+    def avanzar(self, cantidad: int = 1):
+        self.hechos += cantidad
+        if not self.barra:
+            print(f"✓ {self.etiqueta} {self.hechos}/{self.total} procesado")
+            return
+        ahora = time.perf_counter()
+        if self.hechos < self.total and ahora - self._ultimo_dibujo < 0.1:
+            return
+        self._ultimo_dibujo = ahora
+        transcurrido = ahora - self._inicio
+        ritmo = self.hechos / transcurrido if transcurrido > 0 else 0.0
+        restante = (self.total - self.hechos) / ritmo if ritmo > 0 else 0.0
+        llenos = int(self.ancho * self.hechos / self.total) if self.total else self.ancho
+        sys.stderr.write(
+            f"\r{self.etiqueta:<12} [{'#' * llenos}{'.' * (self.ancho - llenos)}] "
+            f"{self.hechos}/{self.total}  {ritmo:6.1f}/s  restante {restante:5.0f}s"
+        )
+        sys.stderr.flush()
+
+    def cerrar(self):
+        if self.barra and self.hechos:
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+
+
+class Instrumentacion:
+
+    def __init__(self, barra_progreso: bool = False):
+        self.barra_progreso = barra_progreso
+        self.inicio = datetime.now()
+        self._inicio = time.perf_counter()
+        self._lock = threading.Lock()
+        self.etapas: Dict[str, dict] = {}
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.errores: Dict[str, int] = defaultdict(int)
+        # Respuestas cortadas por num_predict (done_reason "length")
+        self.truncadas: Dict[str, int] = defaultdict(int)
+        self.tokens: Dict[str, Dict[str, int]] = defaultdict(lambda: {"prompt": 0, "eval": 0})
+        self.cache: Dict[str, Dict[str, int]] = defaultdict(lambda: {"consultas": 0, "aciertos": 0})
+        self.validacion: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    @contextmanager
+    def etapa(self, nombre: str, filas: Optional[int] = None):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            with self._lock:
+                # Una etapa puede repetirse (por chunk o por pasada); se acumula
+                datos = self.etapas.setdefault(nombre, {"segundos": 0.0, "veces": 0, "filas": 0})
+                datos["segundos"] += segundos
+                datos["veces"] += 1
+                datos["filas"] += filas or 0
+
+    def progreso(self, etiqueta: str, total: int) -> Progreso:
+        return Progreso(etiqueta, total, self.barra_progreso)
+
+    def registrar_llamada(self, tarea: str, segundos: float, respuesta=None):
+        with self._lock:
+            self.latencias[tarea].append(segundos)
+            if respuesta is None:
+                self.errores[tarea] += 1
+                return
+            self.tokens[tarea]["prompt"] += int(respuesta.get('prompt_eval_count') or 0)
+            self.tokens[tarea]["eval"] += int(respuesta.get('eval_count') or 0)
+            if respuesta.get('done_reason') == 'length':
+                self.truncadas[tarea] += 1
+
+    def registrar_cache(self, tarea: str, consultas: int, aciertos: int):
+        with self._lock:
+            self.cache[tarea]["consultas"] += consultas
+            self.cache[tarea]["aciertos"] += aciertos
+
+    def registrar_validacion(self, tarea: str, resultado: str):
+        with self._lock:
+            self.validacion[tarea][resultado] += 1
+
+    def reporte(self, filas: int, extra: dict = None) -> dict:
+        segundos = time.perf_counter() - self._inicio
+        with self._lock:
+            llm = {}
+            for tarea, latencias in self.latencias.items():
+                tiempo_llm = sum(latencias)
+                llm[tarea] = {
+                    "llamadas": len(latencias),
+                    "errores": self.errores[tarea],
+                    "truncadas": self.truncadas[tarea],
+                    "tokens_prompt": self.tokens[tarea]["prompt"],
+                    "tokens_eval": self.tokens[tarea]["eval"],
+                    "tokens_eval_por_segundo": self.tokens[tarea]["eval"] / tiempo_llm if tiempo_llm > 0 else None,
+                    "latencia": histograma(latencias),
+                }
+            reporte = {
+                "inicio": self.inicio.isoformat(timespec="seconds"),
+                "filas": filas,
+                "segundos": segundos,
+                "filas_por_segundo": filas / segundos if segundos > 0 else None,
+                "etapas": {
+                    nombre: {
+                        **datos,
+                        "filas_por_segundo": datos["filas"] / datos["segundos"]
+                        if datos["filas"] and datos["segundos"] > 0 else None,
+                    }
+                    for nombre, datos in self.etapas.items()
+                },
+                "llm": llm,
+                "cache": {
+                    tarea: {**datos, "ratio": datos["aciertos"] / datos["consultas"] if datos["consultas"] else None}
+                    for tarea, datos in self.cache.items()
+                },
+                "validacion": {
+                    tarea: {
+                        **conteos,
+                        # Respuestas que no cumplieron el esquema en el primer intento
+                        "tasa_fallo": 1 - conteos.get("valida", 0) / sum(conteos.values()),
+                    }
+                    for tarea, conteos in self.validacion.items()
+                },
+            }
+        reporte.update(extra or {})
+        return reporte
+
+    def guardar(self, ruta: str, filas: int, extra: dict = None) -> dict:
+        reporte = self.reporte(filas, extra)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+        return reporte
+
+    def resumen(self, reporte: dict) -> str:
+        lineas = [f"Tiempo total: {reporte['segundos']:.2f}s ({reporte['filas_por_segundo'] or 0:.1f} filas/s)"]
+        for nombre, datos in sorted(reporte["etapas"].items(), key=lambda item: item[1]["segundos"], reverse=True):
+            lineas.append(f"  {nombre:<22} {datos['segundos']:8.2f}s")
+        for tarea, datos in reporte["llm"].items():
+            p50 = datos["latencia"].get("p50", 0)
+            lineas.append(f"  Llama {tarea:<16} {datos['llamadas']} llamadas, p50 {p50:.2f}s, "
+                          f"{datos['tokens_prompt']} tokens de prompt, {datos['tokens_eval']} generados"
+                          f"{', ' + str(datos['truncadas']) + ' truncadas' if datos['truncadas'] else ''}")
+        for tarea, datos in reporte["validacion"].items():
+            detalle = ", ".join(
+                f"{cantidad} {DESCRIPCION_VALIDACION.get(resultado, resultado)}"
+                for resultado, cantidad in datos.items() if resultado not in ("valida", "tasa_fallo")
+            )
+            lineas.append(f"  Validación {tarea:<11} {datos['tasa_fallo']:.1%} de fallos"
+                          f"{f' ({detalle})' if detalle else ''}")
+        return "\n".join(lineas)
@@ -1,37 +1,224 @@
-import ollama
+import copy
 import json
 import re
-from typing import Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
 import pandas as pd
+from llm_store import clave_resultado, huella_opciones, normalizar_texto
+from similitud import IndiceMinHash
+from instrumentacion import Instrumentacion
+
+CATEGORIAS_MOTIVACION = [
+    "Aprendizaje", "Networking", "Reto_personal",
+    "Pasion_videojuegos", "Experiencia_profesional", "General"
+]
+NIVELES_EXPERIENCIA = ["Principiante", "Intermedio", "Avanzado"]
+NIVELES_COMPROMISO = ["Alto", "Medio", "Bajo"]
+
+TIPOS_CACHE = ["motivacion", "experiencia", "compromiso", "skills"]
+# Tareas que resuelve siempre el prompt fusionado; skills solo se pide con enriquecer_skills_llm
+TIPOS_FUSIONADO = ["motivacion", "experiencia", "compromiso"]
+TIPOS_LOTE = {"motivacion": CATEGORIAS_MOTIVACION, "compromiso": NIVELES_COMPROMISO}
+# Solo tareas con salida categórica: en experiencia y skills una paráfrasis puede cambiar jams o herramientas
+TIPOS_SIMILITUD = ("motivacion", "compromiso")
+
+TEMPERATURA = 0.1
+CARACTERES_POR_TOKEN = 4
+
+# Tokens de entrada por texto: lo que excede se recorta conservando el inicio y el final
+PRESUPUESTO_TOKENS = {"motivacion": 300, "experiencia": 500, "compromiso": 600, "skills": 800, "fusionado": 400}
+
+
+def _tokens_salida(ejemplo: str, margen: int = 4) -> int:
+    # Cota holgada (3 caracteres por token) de lo que ocupa la respuesta más larga válida
+    return len(ejemplo) // 3 + margen
+
+
+# Las tareas de etiqueta a veces anteponen un preámbulo corto ("Nivel de compromiso: Alto");
+# sin este margen num_predict lo cortaría antes de llegar a la etiqueta
+MARGEN_PREAMBULO = 12
+
+
+EJEMPLO_EXPERIENCIA = json.dumps(
+    {"tiene_proyectos": False, "jams_previas": 10, "nivel_real": max(NIVELES_EXPERIENCIA, key=len)}, indent=4
+)
+_EJEMPLO_FUSIONADO = {
+    "motivacion": max(CATEGORIAS_MOTIVACION, key=len),
+    "tiene_proyectos": False,
+    "jams_previas": 10,
+    "nivel_real": max(NIVELES_EXPERIENCIA, key=len),
+    "compromiso": max(NIVELES_COMPROMISO, key=len),
+}
+EJEMPLO_FUSIONADO = json.dumps(_EJEMPLO_FUSIONADO, indent=4)
+EJEMPLO_FUSIONADO_SKILLS = json.dumps({**_EJEMPLO_FUSIONADO, "skills": ["Unreal Engine"] * 15}, indent=4)
+
+CAMPO_SKILLS_FUSIONADO = """,
+    "skills": lista de herramientas, lenguajes y software EXPLÍCITAMENTE MENCIONADOS en el texto (lista vacía si no hay)"""
+
+MAX_TOKENS = {
+    "motivacion": _tokens_salida(max(CATEGORIAS_MOTIVACION, key=len), margen=MARGEN_PREAMBULO),
+    "experiencia": _tokens_salida(EJEMPLO_EXPERIENCIA, margen=16),
+    "compromiso": _tokens_salida(max(NIVELES_COMPROMISO, key=len), margen=MARGEN_PREAMBULO),
+    "skills": _tokens_salida(", ".join(["Unreal Engine"] * 15), margen=MARGEN_PREAMBULO),
+    "fusionado": _tokens_salida(EJEMPLO_FUSIONADO, margen=16),
+    "fusionado_skills": _tokens_salida(EJEMPLO_FUSIONADO_SKILLS, margen=16),
+}
+# La generación se corta al empezar una explicación (línea en blanco) o al cerrar el JSON. Un solo
+# salto de línea no basta como stop: cortaría "Nivel de compromiso:\nAlto" antes de la etiqueta.
+# Ollama no incluye el stop en la respuesta, así que el cierre se vuelve a agregar antes de parsear
+STOP = {
+    "motivacion": ["\n\n"],
+    "compromiso": ["\n\n"],
+    "skills": ["\n\n"],
+    "fusionado": ["}"],
+    "lote": ["]"],
+}
+
+# Salida restringida por gramática (parámetro format de Ollama) para extraer_experiencia
+ESQUEMA_EXPERIENCIA = {
+    "type": "object",
+    "properties": {
+        "tiene_proyectos": {"type": "boolean"},
+        "jams_previas": {"type": "integer", "minimum": 0},
+        "nivel_real": {"type": "string", "enum": NIVELES_EXPERIENCIA},
+    },
+    "required": ["tiene_proyectos", "jams_previas", "nivel_real"],
+}
+# Resultado de cada tarea para una respuesta vacía o sin contenido tras normalizar ("-", "..."): no se
+# consulta a Llama ni se guarda en el store
+RESULTADOS_VACIOS = {
+    "motivacion": "No especificado",
+    "experiencia": {"tiene_proyectos": False, "jams_previas": 0, "nivel_real": "Principiante"},
+    "compromiso": "Bajo",
+    "skills": [],
+}
+# normalizar_texto nunca devuelve "" para un texto con contenido, así que no choca con ninguna clave real
+CLAVE_VACIA = ""
+
+# Cada variante del prompt guarda sus resultados con su propia versión: incrementar la de la variante
+# editada (en fusionado, un mismo prompt produce todas sus tareas)
+PROMPT_VERSIONES = {
+    "individual": {"motivacion": 1, "experiencia": 1, "compromiso": 1, "skills": 1},
+    "lote": {"motivacion": 1, "compromiso": 1},
+    "fusionado": {"motivacion": 1, "experiencia": 1, "compromiso": 1, "skills": 1},
+}
+
+
+def recortar(texto: str, presupuesto_tokens: int) -> str:
+    texto = str(texto)
+    limite = presupuesto_tokens * CARACTERES_POR_TOKEN
+    if len(texto) <= limite:
+        return texto
+    # Inicio y final suelen concentrar lo relevante; se corta en espacios para no partir palabras
+    cabeza = texto[:limite * 2 // 3].rsplit(" ", 1)[0]
+    cola = texto[-(limite // 3):].split(" ", 1)[-1]
+    return f"{cabeza} [... recortado, {len(texto)} caracteres en total ...] {cola}"
+
+
+def validar_experiencia(data) -> List[str]:
+    if not isinstance(data, dict):
+        return ["la respuesta no es un objeto JSON"]
+    errores = []
+    if not isinstance(data.get("tiene_proyectos"), bool):
+        errores.append('"tiene_proyectos" debe ser true o false')
+    jams = data.get("jams_previas")
+    if isinstance(jams, bool) or not isinstance(jams, int) or jams < 0:
+        errores.append('"jams_previas" debe ser un entero mayor o igual a 0')
+    if data.get("nivel_real") not in NIVELES_EXPERIENCIA:
+        errores.append(f'"nivel_real" debe ser uno de {", ".join(NIVELES_EXPERIENCIA)}')
+    return errores
+
+
+def _parsear_json(respuesta: str):
+    try:
+        return json.loads(respuesta)
+    except json.JSONDecodeError:
+        pass
+    # Clientes que ignoran format pueden envolver el JSON en texto
+    json_match = re.search(r'\{.*\}', respuesta, re.DOTALL)
+    if not json_match:
+        return None
+    try:
+        return json.loads(json_match.group())
+    except json.JSONDecodeError:
+        return None
+
+
+def _primera_etiqueta(respuesta: str, categorias: List[str]):
+    # La etiqueta que aparece primero como palabra completa ("Bajo, no Alto" es Bajo), sin importar
+    # tildes, mayúsculas ni guiones bajos ("Pasión videojuegos")
+    texto = f" {normalizar_texto(respuesta)} "
+    encontradas = [(texto.find(f" {normalizar_texto(cat)} "), cat) for cat in categorias]
+    encontradas = [(posicion, cat) for posicion, cat in encontradas if posicion >= 0]
+    return min(encontradas)[1] if encontradas else None
+
+
+def _cerrar(respuesta: str, apertura: str, cierre: str) -> str:
+    if respuesta.lstrip().startswith(apertura) and not respuesta.rstrip().endswith(cierre):
+        return respuesta + cierre
+    return respuesta
+
 
 class LlamaAnalyzer:
     
-    def __init__(self, model_name: str = "llama3.2"):
+    def __init__(self, model_name: str = "llama3.2", max_concurrencia: int = 1,
+                 tamano_lote: int = 1, max_caracteres_lote: int = 6000, store=None, cliente=None,
+                 umbral_similitud: float = None, tipos_similitud=TIPOS_SIMILITUD, instrumentacion=None):
         self.model_name = model_name
-        print(f"Inicializando analizador con modelo: {model_name}")
+        self.store = store
+        if cliente is None:
+            # Import diferido: con un cliente propio (pool, Ollama falso) no hace falta tener ollama instalado
+            import ollama
+            cliente = ollama
+        self.cliente = cliente
+        self.max_concurrencia = max(1, int(max_concurrencia))
+        self.tamano_lote = max(1, int(tamano_lote))
+        self.max_caracteres_lote = max_caracteres_lote
+        self.umbral_similitud = umbral_similitud
+        self.tipos_similitud = tuple(tipos_similitud)
+        self.instrumentacion = instrumentacion or Instrumentacion()
+        self.estadisticas_reuso = {tipo: {"normalizacion": 0, "similitud": 0} for tipo in TIPOS_CACHE}
+        self._indices_similitud = {}
+        # Claves cuyo resultado se copió de un texto similar: valen en la corrida, pero no se guardan en el
+        # store ni entran al índice (C no debe heredar de B lo que B heredó de A)
+        self._prestados = {tipo: set() for tipo in TIPOS_CACHE}
+        self._local = threading.local()
+        print(f"Inicializando analizador con modelo: {model_name} (concurrencia: {self.max_concurrencia})")
         
-    def _query_llama(self, prompt: str, max_tokens: int = 100) -> str:
+    def _query_llama(self, prompt: str, max_tokens: int = 100, tarea: str = "otro", stop: List[str] = None,
+                     formato: dict = None) -> str:
+        opciones = {
+            'temperature': TEMPERATURA,
+            'num_predict': max_tokens
+        }
+        if stop:
+            opciones['stop'] = stop
+        extra = {'format': formato} if formato else {}
+        inicio = time.perf_counter()
         try:
-            response = ollama.generate(
+            response = self.cliente.generate(
                 model=self.model_name,
                 prompt=prompt,
-                options={
-                    'temperature': 0.1,
-                    'num_predict': max_tokens
-                }
+                options=opciones,
+                **extra
             )
-            return response['response'].strip()
         except Exception as e:
+            self.instrumentacion.registrar_llamada(tarea, time.perf_counter() - inicio)
             print(f"Error al consultar Llama: {e}")
+            self._local.fallida = True
             return ""
+        self.instrumentacion.registrar_llamada(tarea, time.perf_counter() - inicio, response)
+        return response['response'].strip()
     
     def clasificar_motivacion(self, texto: str) -> str:
-        if not texto or pd.isna(texto):
-            return "No especificado"
+        if not self._clave_cache(texto):
+            return self._resultado_vacio("motivacion")
         
         prompt = f"""Analiza esta respuesta sobre por qué alguien quiere participar en un Game Jam:
 
-"{texto}"
+"{recortar(texto, PRESUPUESTO_TOKENS["motivacion"])}"
 
 Clasifícala en UNA de estas categorías exactas:
 - Aprendizaje
@@ -43,30 +230,23 @@ Clasifícala en UNA de estas categorías exactas:
 
 Responde SOLO con el nombre de la categoría, sin explicaciones adicionales."""
         
-        respuesta = self._query_llama(prompt, max_tokens=20)
-        
-        categorias_validas = [
-            "Aprendizaje", "Networking", "Reto_personal", 
-            "Pasion_videojuegos", "Experiencia_profesional", "General"
-        ]
-        
-        for cat in categorias_validas:
-            if cat.lower() in respuesta.lower():
-                return cat
-        
-        return "General"
+        respuesta = self._query_llama(prompt, max_tokens=MAX_TOKENS["motivacion"], tarea="motivacion",
+                                      stop=STOP["motivacion"])
+        return self._etiqueta(respuesta, CATEGORIAS_MOTIVACION, "General", "motivacion")
+    
+    def _etiqueta(self, respuesta: str, categorias: List[str], default: str, tarea: str) -> str:
+        etiqueta = _primera_etiqueta(respuesta, categorias)
+        # Sin etiqueta reconocible se usa el default, pero queda registrado en vez de pasar inadvertido
+        self.instrumentacion.registrar_validacion(tarea, "valida" if etiqueta else "sin_etiqueta")
+        return etiqueta or default
     
     def extraer_experiencia(self, texto: str) -> Dict[str, any]:
-        if not texto or pd.isna(texto):
-            return {
-                "tiene_proyectos": False,
-                "jams_previas": 0,
-                "nivel_real": "Principiante"
-            }
+        if not self._clave_cache(texto):
+            return self._resultado_vacio("experiencia")
         
         prompt = f"""Analiza esta descripción de experiencia en desarrollo de videojuegos:
 
-"{texto}"
+"{recortar(texto, PRESUPUESTO_TOKENS["experiencia"])}"
 
 Extrae la siguiente información y responde SOLO en formato JSON:
 {{
@@ -77,22 +257,42 @@ Extrae la siguiente información y responde SOLO en formato JSON:
 
 Responde SOLO con el JSON, sin texto adicional."""
         
-        respuesta = self._query_llama(prompt, max_tokens=150)
+        respuesta = self._query_llama(prompt, max_tokens=MAX_TOKENS["experiencia"], tarea="experiencia",
+                                      formato=ESQUEMA_EXPERIENCIA)
+        data = _parsear_json(respuesta)
+        errores = validar_experiencia(data)
+        if not errores:
+            self.instrumentacion.registrar_validacion("experiencia", "valida")
+            return {clave: data[clave] for clave in ESQUEMA_EXPERIENCIA["required"]}
         
-        try:
-            json_match = re.search(r'\{.*\}', respuesta, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return {
-                    "tiene_proyectos": bool(data.get("tiene_proyectos", False)),
-                    "jams_previas": int(data.get("jams_previas", 0)),
-                    "nivel_real": data.get("nivel_real", "Principiante")
-                }
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            print(f"Error parseando JSON de Llama: {e}")
+        if respuesta:
+            reparado = self._reparar_experiencia(respuesta, errores)
+            if reparado is not None:
+                self.instrumentacion.registrar_validacion("experiencia", "reparada")
+                return reparado
         
+        print(f"Respuesta de experiencia inválida ({'; '.join(errores)}), se usan heurísticas")
+        self.instrumentacion.registrar_validacion("experiencia", "heuristica")
         return self._fallback_experiencia(texto)
     
+    def _reparar_experiencia(self, respuesta: str, errores: List[str]):
+        # Un solo intento barato: solo la respuesta defectuosa y sus errores, sin reenviar el texto original
+        prompt = f"""Esta respuesta debía ser un JSON válido con las claves "tiene_proyectos", "jams_previas" y "nivel_real":
+
+{respuesta[:MAX_TOKENS["experiencia"] * CARACTERES_POR_TOKEN]}
+
+Errores encontrados:
+{chr(10).join(f"- {error}" for error in errores)}
+
+Corrige solo esos errores y responde SOLO con el JSON corregido."""
+        
+        reparada = self._query_llama(prompt, max_tokens=MAX_TOKENS["experiencia"], tarea="experiencia_reparacion",
+                                     formato=ESQUEMA_EXPERIENCIA)
+        data = _parsear_json(reparada)
+        if validar_experiencia(data):
+            return None
+        return {clave: data[clave] for clave in ESQUEMA_EXPERIENCIA["required"]}
+    
     def _fallback_experiencia(self, texto: str) -> Dict[str, any]:
         texto_lower = texto.lower()
         
@@ -118,12 +318,12 @@ Responde SOLO con el JSON, sin texto adicional."""
         }
     
     def analizar_compromiso(self, texto: str) -> str:
-        if not texto or pd.isna(texto):
-            return "Bajo"
+        if not self._clave_cache(texto):
+            return self._resultado_vacio("compromiso")
         
         prompt = f"""Analiza estas respuestas de un participante a un Game Jam:
 
-"{texto}"
+"{recortar(texto, PRESUPUESTO_TOKENS["compromiso"])}"
 
 Evalúa su nivel de compromiso basándote en:
 - Detalle y profundidad de las respuestas
@@ -137,22 +337,17 @@ Clasifica en UNA de estas categorías:
 
 Responde SOLO con: Alto, Medio o Bajo"""
         
-        respuesta = self._query_llama(prompt, max_tokens=20)
-        
-        if "alto" in respuesta.lower():
-            return "Alto"
-        elif "medio" in respuesta.lower():
-            return "Medio"
-        else:
-            return "Bajo"
+        respuesta = self._query_llama(prompt, max_tokens=MAX_TOKENS["compromiso"], tarea="compromiso",
+                                      stop=STOP["compromiso"])
+        return self._etiqueta(respuesta, NIVELES_COMPROMISO, "Bajo", "compromiso")
     
     def extraer_skills(self, texto: str) -> List[str]:
-        if not texto or pd.isna(texto):
-            return []
+        if not self._clave_cache(texto):
+            return self._resultado_vacio("skills")
         
         prompt = f"""Analiza este texto sobre experiencia en desarrollo de videojuegos:
 
-"{texto}"
+"{recortar(texto, PRESUPUESTO_TOKENS["skills"])}"
 
 Extrae SOLAMENTE las herramientas, tecnologías y skills técnicas que estén EXPLÍCITAMENTE MENCIONADAS en el texto.
 
@@ -165,45 +360,410 @@ Responde con una lista separada por comas, sin numeración ni texto adicional.
 Ejemplo si hay skills: Unity, C#, Blender
 Ejemplo si no hay skills: NINGUNA"""
         
-        respuesta = self._query_llama(prompt, max_tokens=100)
+        respuesta = self._query_llama(prompt, max_tokens=MAX_TOKENS["skills"], tarea="skills", stop=STOP["skills"])
         
         if "NINGUNA" in respuesta or "ninguna" in respuesta.lower():
             return []
         
-        skills = [s.strip() for s in respuesta.split(',')]
+        return self._limpiar_skills(respuesta.split(','))
+    
+    def _limpiar_skills(self, skills: List[str]) -> List[str]:
+        skills = [str(s).strip() for s in skills]
         
         skills_limpias = []
         for skill in skills:
-            if len(skill) < 30 and not any(word in skill.lower() for word in ['ejemplo', 'respuesta', 'texto', 'sin', 'etc', 'ninguna']):
+            if skill and len(skill) < 30 and not any(word in skill.lower() for word in ['ejemplo', 'respuesta', 'texto', 'sin', 'etc', 'ninguna']):
                 skills_limpias.append(skill)
         
         return skills_limpias[:15]
 
-    def procesar_batch_con_cache(self, textos: List[str], tipo: str, cache: Dict = None) -> List:
+    def analizar_fusionado(self, motivacion: str, experiencia: str, profesional: str,
+                           con_skills: bool = False) -> Dict[str, any]:
+        # Sin con_skills el campo ni se pide: la respuesta se descartaría y es la parte más larga de la salida
+        campo_skills = CAMPO_SKILLS_FUSIONADO if con_skills else ""
+        prompt = f"""Analiza estas respuestas de un participante a un Game Jam.
+
+Motivación para participar:
+"{recortar(motivacion, PRESUPUESTO_TOKENS["fusionado"])}"
+
+Experiencia en desarrollo de videojuegos:
+"{recortar(experiencia, PRESUPUESTO_TOKENS["fusionado"])}"
+
+Experiencia como estudiante y/o profesional:
+"{recortar(profesional, PRESUPUESTO_TOKENS["fusionado"])}"
+
+Responde SOLO con un JSON con exactamente estas claves:
+{{
+    "motivacion": una de {", ".join(CATEGORIAS_MOTIVACION)},
+    "tiene_proyectos": true/false (si menciona haber completado proyectos de juegos),
+    "jams_previas": número (cuántas jams/hackathons ha participado, 0 si no menciona),
+    "nivel_real": una de {", ".join(NIVELES_EXPERIENCIA)} (nivel real según lo que describe),
+    "compromiso": una de {", ".join(NIVELES_COMPROMISO)} (Alto: detallado y específico, Medio: completo pero genérico, Bajo: vago o corto){campo_skills}
+}}
+
+Responde SOLO con el JSON, sin texto adicional."""
+        
+        max_tokens = MAX_TOKENS["fusionado_skills" if con_skills else "fusionado"]
+        respuesta = self._query_llama(prompt, max_tokens=max_tokens, tarea="fusionado", stop=STOP["fusionado"])
+        respuesta = _cerrar(respuesta, "{", "}")
+        return self._validar_fusionado(respuesta, con_skills)
+    
+    def _validar_fusionado(self, respuesta: str, con_skills: bool = False) -> Dict[str, any]:
+        resultado = {tipo: None for tipo in TIPOS_FUSIONADO + (["skills"] if con_skills else [])}
+        try:
+            json_match = re.search(r'\{.*\}', respuesta, re.DOTALL)
+            data = json.loads(json_match.group()) if json_match else None
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error parseando JSON fusionado de Llama: {e}")
+            data = None
+        if not isinstance(data, dict):
+            return resultado
+        
+        motivacion = str(data.get("motivacion", "")).strip().lower()
+        for cat in CATEGORIAS_MOTIVACION:
+            if cat.lower() == motivacion:
+                resultado["motivacion"] = cat
+        
+        nivel = str(data.get("nivel_real", "")).strip().lower()
+        try:
+            jams = int(data.get("jams_previas"))
+            if isinstance(data.get("tiene_proyectos"), bool) and jams >= 0:
+                for cat in NIVELES_EXPERIENCIA:
+                    if cat.lower() == nivel:
+                        resultado["experiencia"] = {
+                            "tiene_proyectos": data["tiene_proyectos"],
+                            "jams_previas": jams,
+                            "nivel_real": cat
+                        }
+        except (TypeError, ValueError):
+            pass
+        
+        compromiso = str(data.get("compromiso", "")).strip().lower()
+        for cat in NIVELES_COMPROMISO:
+            if cat.lower() == compromiso:
+                resultado["compromiso"] = cat
+        
+        skills = data.get("skills")
+        if con_skills and isinstance(skills, list):
+            resultado["skills"] = self._limpiar_skills(skills)
+        
+        return resultado
+    
+    def procesar_fusionado_con_cache(self, textos: Dict[str, List[str]], profesional: List[str],
+                                     caches: Dict[str, Dict], max_concurrencia: int = None,
+                                     resueltos: Dict[str, List[bool]] = None, con_skills: bool = False) -> int:
+        concurrencia = max(1, int(max_concurrencia or self.max_concurrencia))
+        tipos = TIPOS_FUSIONADO + (["skills"] if con_skills else [])
+        prompts = {tipo: self._prompt(tipo, "fusionado", con_skills) for tipo in tipos}
+        for tipo in tipos:
+            self._precargar_store(tipo, map(self._clave_cache, textos[tipo]), caches[tipo], prompts[tipo])
+        
+        pendientes = {}
+        completos = 0
+        for i in range(len(profesional)):
+            claves = {tipo: self._clave_cache(textos[tipo][i]) for tipo in tipos}
+            faltantes = tuple(
+                tipo for tipo in tipos
+                if claves[tipo] != CLAVE_VACIA and claves[tipo] not in caches[tipo]
+                and not (resueltos and resueltos[tipo][i])
+            )
+            if not faltantes:
+                completos += 1
+                continue
+            entrada = (textos["motivacion"][i], textos["experiencia"][i], profesional[i], con_skills)
+            pendientes.setdefault(entrada, (claves, faltantes))
+        
+        total = len(pendientes)
+        self.instrumentacion.registrar_cache("fusionado", len(profesional), completos)
+        print(f"✓ fusionado: {total} registros por procesar")
+        progreso = self.instrumentacion.progreso("fusionado", total)
+        
+        def guardar(claves, faltantes, resultado):
+            for tipo in faltantes:
+                if resultado[tipo] is not None:
+                    caches[tipo][claves[tipo]] = resultado[tipo]
+                    self._guardar_store(tipo, {claves[tipo]: resultado[tipo]}, prompts[tipo])
+        
+        if concurrencia > 1 and total > 1:
+            with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+                futuros = {
+                    executor.submit(self.analizar_fusionado, *entrada): pendientes[entrada]
+                    for entrada in pendientes
+                }
+                for futuro in as_completed(futuros):
+                    guardar(*futuros[futuro], futuro.result())
+                    progreso.avanzar()
+        else:
+            for entrada, (claves, faltantes) in pendientes.items():
+                guardar(claves, faltantes, self.analizar_fusionado(*entrada))
+                progreso.avanzar()
+        progreso.cerrar()
+        
+        return total
+    
+    def clasificar_lote(self, textos: List[str], tipo: str) -> List[str]:
+        categorias = TIPOS_LOTE[tipo]
+        respuestas = "\n".join(
+            f'{i+1}. "{recortar(texto, PRESUPUESTO_TOKENS[tipo])}"' for i, texto in enumerate(textos)
+        )
+        
+        if tipo == "motivacion":
+            instrucciones = f"""Clasifica cada una de estas respuestas sobre por qué alguien quiere participar en un Game Jam:
+
+{respuestas}
+
+Categorías exactas: {", ".join(categorias)}"""
+        else:
+            instrucciones = f"""Evalúa el nivel de compromiso de cada una de estas respuestas de participantes a un Game Jam:
+
+{respuestas}
+
+Criterios:
+- Alto (respuestas detalladas, específicas, muestra compromiso claro)
+- Medio (respuestas completas pero genéricas)
+- Bajo (respuestas vagas, cortas o poco específicas)"""
+        
+        prompt = f"""{instrucciones}
+
+Responde SOLO con un arreglo JSON de {len(textos)} elementos con la categoría de cada respuesta, en el mismo orden.
+Ejemplo: ["{categorias[0]}", "{categorias[1]}"]"""
+        
+        etiqueta_larga = f'"{max(categorias, key=len)}", '
+        respuesta = self._query_llama(prompt, max_tokens=_tokens_salida(etiqueta_larga * len(textos)),
+                                      tarea=f"{tipo}_lote", stop=STOP["lote"])
+        respuesta = _cerrar(respuesta, "[", "]")
+        
+        try:
+            json_match = re.search(r'\[.*\]', respuesta, re.DOTALL)
+            etiquetas = json.loads(json_match.group()) if json_match else None
+        except (json.JSONDecodeError, ValueError):
+            etiquetas = None
+        if not isinstance(etiquetas, list) or len(etiquetas) != len(textos):
+            return [None] * len(textos)
+        
+        validas = {cat.lower(): cat for cat in categorias}
+        return [validas.get(str(e).strip().lower()) for e in etiquetas]
+    
+    def _resolver_lote(self, textos: List[str], tipo: str) -> List:
+        if len(textos) == 1:
+            return [self._analizar(textos[0], tipo)]
+        
+        etiquetas = self.clasificar_lote(textos, tipo)
+        faltantes = [i for i, e in enumerate(etiquetas) if e is None]
+        if len(faltantes) == len(textos):
+            mitad = len(textos) // 2
+            return self._resolver_lote(textos[:mitad], tipo) + self._resolver_lote(textos[mitad:], tipo)
+        if faltantes:
+            reintento = self._resolver_lote([textos[i] for i in faltantes], tipo)
+            for i, etiqueta in zip(faltantes, reintento):
+                etiquetas[i] = etiqueta
+        return etiquetas
+    
+    def _agrupar_lotes(self, pendientes: List[tuple], tipo: str) -> List[List[tuple]]:
+        if tipo not in TIPOS_LOTE or self.tamano_lote <= 1:
+            return [[item] for item in pendientes]
+        
+        lotes = []
+        actual, caracteres = [], 0
+        for clave, texto in pendientes:
+            largo = len(str(texto))
+            if actual and (len(actual) >= self.tamano_lote or caracteres + largo > self.max_caracteres_lote):
+                lotes.append(actual)
+                actual, caracteres = [], 0
+            actual.append((clave, texto))
+            caracteres += largo
+        if actual:
+            lotes.append(actual)
+        return lotes
+    
+    @staticmethod
+    def _clave_cache(texto: str) -> str:
+        if not isinstance(texto, str) and pd.isna(texto):
+            return CLAVE_VACIA
+        return normalizar_texto(texto)
+    
+    @staticmethod
+    def _resultado_vacio(tipo: str):
+        return copy.deepcopy(RESULTADOS_VACIOS[tipo])
+    
+    @staticmethod
+    def _opciones(tipo: str) -> Dict:
+        opciones = {"temperature": TEMPERATURA, "num_predict": MAX_TOKENS[tipo], "stop": STOP.get(tipo)}
+        if tipo == "experiencia":
+            opciones["format"] = ESQUEMA_EXPERIENCIA
+        return opciones
+    
+    def _variante(self, tipo: str) -> str:
+        # Prompt con que procesar_batch_con_cache resuelve la tarea
+        return "lote" if tipo in TIPOS_LOTE and self.tamano_lote > 1 else "individual"
+    
+    def _prompt(self, tipo: str, variante: str, con_skills: bool = False) -> Tuple[int, Dict]:
+        # (versión, opciones) de la variante que produjo un resultado: forman parte de su clave en el store,
+        # así un resultado de lote o fusionado nunca se sirve a una corrida con prompt individual ni al revés
+        if variante == "lote":
+            opciones = {"temperature": TEMPERATURA, "stop": STOP["lote"], "tamano_lote": self.tamano_lote,
+                        "max_caracteres_lote": self.max_caracteres_lote}
+        elif variante == "fusionado":
+            opciones = {"temperature": TEMPERATURA, "stop": STOP["fusionado"], "skills": con_skills,
+                        "num_predict": MAX_TOKENS["fusionado_skills" if con_skills else "fusionado"]}
+        else:
+            opciones = self._opciones(tipo)
+        return PROMPT_VERSIONES[variante][tipo], {"variante": variante, **opciones}
+    
+    def _clave_store(self, tipo: str, clave: str, prompt: Tuple[int, Dict]) -> str:
+        version, opciones = prompt
+        return clave_resultado(tipo, self.model_name, version, opciones, clave)
+    
+    def _precargar_store(self, tipo: str, claves, cache: Dict, prompt: Tuple[int, Dict]):
+        if self.store is None:
+            return
+        hashes = {self._clave_store(tipo, clave, prompt): clave for clave in set(claves) if clave not in cache}
+        for hash_clave, resultado in self.store.get_many(hashes).items():
+            cache[hashes[hash_clave]] = resultado
+    
+    def _guardar_store(self, tipo: str, resultados: Dict, prompt: Tuple[int, Dict]):
+        if self.store is None:
+            return
+        version, opciones = prompt
+        huella = huella_opciones(opciones)
+        self.store.put_many([
+            (self._clave_store(tipo, clave, prompt), tipo, self.model_name, version, resultado, clave, huella)
+            for clave, resultado in resultados.items()
+        ])
+    
+    def importar_resultados(self, tipo: str, resultados: Dict) -> int:
+        # La cache JSON heredada venía de los prompts individuales
+        resultados = {self._clave_cache(texto): resultado for texto, resultado in resultados.items()}
+        resultados.pop(CLAVE_VACIA, None)
+        self._guardar_store(tipo, resultados, self._prompt(tipo, "individual"))
+        return len(resultados)
+    
+    def _indice_similitud(self, tipo: str, prompt: Tuple[int, Dict]):
+        # El historial del store se carga una vez por analizador, solo el generado con la misma variante,
+        # versión y opciones (num_predict, stop, format); después el índice solo recibe los resultados nuevos
+        if tipo not in self._indices_similitud:
+            conocidos = {}
+            if self.store is not None:
+                version, opciones = prompt
+                conocidos = self.store.textos(tipo, self.model_name, version, huella_opciones(opciones))
+            indice = IndiceMinHash(self.umbral_similitud)
+            for clave in conocidos:
+                indice.agregar(clave)
+            self._indices_similitud[tipo] = (indice, conocidos)
+        return self._indices_similitud[tipo]
+    
+    def _agrupar_similares(self, tipo: str, pendientes: Dict, cache: Dict,
+                           prompt: Tuple[int, Dict]) -> Dict[str, str]:
+        if self.umbral_similitud is None or tipo not in self.tipos_similitud or not pendientes:
+            return {}
+        indice, conocidos = self._indice_similitud(tipo, prompt)
+        prestados = self._prestados[tipo]
+        for clave in cache.keys() - conocidos.keys() - prestados:
+            conocidos[clave] = cache[clave]
+            indice.agregar(clave)
+        
+        # Cada pendiente sin vecino pasa a ser representante; los parecidos a un representante
+        # esperan su resultado en vez de generar otra llamada
+        similares, reusados = {}, {}
+        for clave in list(pendientes):
+            vecino = indice.vecino(clave)
+            if vecino in pendientes and vecino != clave:
+                similares[clave] = vecino
+            elif vecino in conocidos:
+                reusados[clave] = cache[clave] = conocidos[vecino]
+                prestados.add(clave)
+            else:
+                # Sin vecino, o representante de una corrida anterior que quedó sin resultado
+                indice.agregar(clave)
+                continue
+            del pendientes[clave]
+        
+        self.estadisticas_reuso[tipo]["similitud"] += len(reusados) + len(similares)
+        if reusados or similares:
+            print(f"✓ {tipo}: {len(reusados) + len(similares)} textos reutilizan el resultado de uno similar")
+        return similares
+    
+    def _sin_fallas(self, funcion, *args):
+        # Devuelve (resultado, exitoso): si alguna llamada a Llama falló, el resultado sale de valores
+        # por defecto o heurísticas y no debe quedar en la cache ni en el store
+        self._local.fallida = False
+        resultado = funcion(*args)
+        return resultado, not self._local.fallida
+    
+    def _analizar(self, texto: str, tipo: str):
+        if tipo == "motivacion":
+            return self.clasificar_motivacion(texto)
+        elif tipo == "experiencia":
+            return self.extraer_experiencia(texto)
+        elif tipo == "compromiso":
+            return self.analizar_compromiso(texto)
+        elif tipo == "skills":
+            return self.extraer_skills(texto)
+        return None
+
+    def procesar_batch_con_cache(self, textos: List[str], tipo: str, cache: Dict = None,
+                                 max_concurrencia: int = None) -> List:
         if cache is None:
             cache = {}
+        concurrencia = max(1, int(max_concurrencia or self.max_concurrencia))
+        
+        claves = [self._clave_cache(texto) for texto in textos]
+        prompt = self._prompt(tipo, self._variante(tipo))
+        self._precargar_store(tipo, claves, cache, prompt)
+        pendientes = {}
+        crudos = set()
+        for clave, texto in zip(claves, textos):
+            if clave != CLAVE_VACIA and clave not in cache:
+                crudos.add(str(texto))
+                pendientes.setdefault(clave, texto)
+        self.estadisticas_reuso[tipo]["normalizacion"] += len(crudos) - len(pendientes)
+        
+        vacios = claves.count(CLAVE_VACIA)
+        en_cache = sum(1 for clave in claves if clave not in pendientes) - vacios
+        self.instrumentacion.registrar_cache(tipo, len(textos) - vacios, en_cache)
+        print(f"✓ {tipo}: {en_cache}/{len(textos) - vacios} en cache ({vacios} vacíos), "
+              f"{len(pendientes)} textos únicos por procesar")
+        similares = self._agrupar_similares(tipo, pendientes, cache, prompt)
+        
+        total = len(pendientes)
+        lotes = self._agrupar_lotes(list(pendientes.items()), tipo)
+        progreso = self.instrumentacion.progreso(tipo, total)
         
-        resultados = []
-        for i, texto in enumerate(textos):
-            texto_key = str(texto) if texto else "none"
-            
-            if texto_key in cache:
-                resultados.append(cache[texto_key])
-                print(f"✓ {tipo} {i+1}/{len(textos)} (cached)")
+        # Resultados de lotes con alguna llamada fallida: se usan en esta corrida y se reintentan en la próxima
+        fallidos = {}
+        
+        def guardar(lote, resultados, exitoso):
+            destino = cache if exitoso else fallidos
+            for (clave, _), resultado in zip(lote, resultados):
+                destino[clave] = resultado
+            if exitoso:
+                self._guardar_store(tipo, {clave: cache[clave] for clave, _ in lote}, prompt)
+            progreso.avanzar(len(lote))
+        
+        if concurrencia > 1 and len(lotes) > 1:
+            with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+                futuros = {
+                    executor.submit(self._sin_fallas, self._resolver_lote, [texto for _, texto in lote], tipo): lote
+                    for lote in lotes
+                }
+                for futuro in as_completed(futuros):
+                    guardar(futuros[futuro], *futuro.result())
+        else:
+            for lote in lotes:
+                guardar(lote, *self._sin_fallas(self._resolver_lote, [texto for _, texto in lote], tipo))
+        progreso.cerrar()
+        
+        for clave, vecino in similares.items():
+            if vecino in cache:
+                cache[clave] = cache[vecino]
+                self._prestados[tipo].add(clave)
             else:
-                if tipo == "motivacion":
-                    resultado = self.clasificar_motivacion(texto)
-                elif tipo == "experiencia":
-                    resultado = self.extraer_experiencia(texto)
-                elif tipo == "compromiso":
-                    resultado = self.analizar_compromiso(texto)
-                elif tipo == "skills":
-                    resultado = self.extraer_skills(texto)
-                else:
-                    resultado = None
-                
-                resultados.append(resultado)
-                cache[texto_key] = resultado
-                print(f"✓ {tipo} {i+1}/{len(textos)} procesado")
-        
-        return resultados
\ No newline at end of file
+                fallidos[clave] = fallidos[vecino]
+        if fallidos:
+            print(f"⚠ {tipo}: {len(fallidos)} textos sin respuesta de Llama quedan con el valor por defecto "
+                  f"y no se guardan en cache")
+        
+        return [
+            self._resultado_vacio(tipo) if clave == CLAVE_VACIA else cache.get(clave, fallidos.get(clave))
+            for clave in claves
+        ]
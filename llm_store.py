@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+# '#' y '+' se conservan para no confundir C# con C++
+PATRON_PUNTUACION = re.compile(r'[^\w\s#+]|_')
+
+
+def normalizar_texto(texto: str) -> str:
+    # Respuestas que solo difieren en tildes, mayúsculas, puntuación o espacios comparten resultado
+    sin_tildes = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return " ".join(PATRON_PUNTUACION.sub(" ", sin_tildes.lower()).split())
+
+
+def huella_opciones(opciones: Dict) -> str:
+    contenido = json.dumps(opciones, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:16]
+
+
+def clave_resultado(tarea: str, modelo: str, version: int, opciones: Dict, texto: str) -> str:
+    contenido = json.dumps(
+        [tarea, modelo, version, opciones, normalizar_texto(texto)],
+        ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+class LLMResultStore:
+
+    LIMITE_PARAMETROS = 500
+    CHECKPOINT_RESULTADOS = 100
+    CHECKPOINT_SEGUNDOS = 10.0
+    VERSION_ESQUEMA = 1
+
+    def __init__(self, ruta: str = "data/llm_cache.sqlite", checkpoint_resultados: int = CHECKPOINT_RESULTADOS,
+                 checkpoint_segundos: float = CHECKPOINT_SEGUNDOS):
+        self.ruta = ruta
+        # Los resultados se confirman cada checkpoint_resultados inserciones o checkpoint_segundos,
+        # lo que ocurra primero: una corrida interrumpida pierde como mucho ese intervalo
+        self.checkpoint_resultados = max(1, int(checkpoint_resultados))
+        self.checkpoint_segundos = checkpoint_segundos
+        self._sin_confirmar = 0
+        self._ultimo_commit = time.monotonic()
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                clave TEXT PRIMARY KEY,
+                tarea TEXT NOT NULL,
+                modelo TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                resultado TEXT NOT NULL,
+                creado REAL NOT NULL,
+                texto TEXT,
+                opciones TEXT
+            )
+        """)
+        columnas = {fila[1] for fila in self._conn.execute("PRAGMA table_info(resultados)")}
+        if "texto" not in columnas:
+            self._conn.execute("ALTER TABLE resultados ADD COLUMN texto TEXT")
+        if "opciones" not in columnas:
+            # Huella de las opciones de generación; las filas anteriores quedan en NULL y no se usan
+            # como vecinos en la búsqueda por similitud
+            self._conn.execute("ALTER TABLE resultados ADD COLUMN opciones TEXT")
+        self._migrar()
+        self._conn.commit()
+
+    def _migrar(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # Las respuestas vacías o de pura puntuación compartían la clave "none" con el resultado de
+            # la primera que llegaba a Llama; ya no se guardan, así que esas filas se descartan
+            self._conn.execute("DELETE FROM resultados WHERE texto = 'none'")
+        self._conn.execute(f"PRAGMA user_version = {self.VERSION_ESQUEMA}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+
+    def get(self, clave: str, default=None):
+        return self.get_many([clave]).get(clave, default)
+
+    def get_many(self, claves: Iterable[str]) -> Dict[str, any]:
+        claves = list(claves)
+        encontrados = {}
+        with self._lock:
+            for i in range(0, len(claves), self.LIMITE_PARAMETROS):
+                bloque = claves[i:i + self.LIMITE_PARAMETROS]
+                filas = self._conn.execute(
+                    f"SELECT clave, resultado FROM resultados WHERE clave IN ({','.join('?' * len(bloque))})",
+                    bloque
+                ).fetchall()
+                for clave, resultado in filas:
+                    encontrados[clave] = json.loads(resultado)
+        return encontrados
+
+    def textos(self, tarea: str, modelo: str, version: int, opciones: str) -> Dict[str, any]:
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT texto, resultado FROM resultados "
+                "WHERE tarea = ? AND modelo = ? AND version = ? AND opciones = ? AND texto IS NOT NULL",
+                (tarea, modelo, version, opciones)
+            ).fetchall()
+        return {texto: json.loads(resultado) for texto, resultado in filas}
+
+    def put(self, clave: str, tarea: str, modelo: str, version: int, resultado, texto: str = None,
+            opciones: str = None):
+        # Pasa por put_many para aplicar el mismo checkpoint por cantidad y por tiempo
+        self.put_many([(clave, tarea, modelo, version, resultado, texto, opciones)])
+
+    def put_many(self, registros: List[Tuple[str, str, str, int, any, str, str]]):
+        if not registros:
+            return
+        ahora = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO resultados (clave, tarea, modelo, version, resultado, creado, texto, opciones) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (clave, tarea, modelo, version, json.dumps(resultado, ensure_ascii=False), ahora, texto, opciones)
+                    for clave, tarea, modelo, version, resultado, texto, opciones in registros
+                ]
+            )
+            self._sin_confirmar += len(registros)
+            if (self._sin_confirmar >= self.checkpoint_resultados
+                    or time.monotonic() - self._ultimo_commit >= self.checkpoint_segundos):
+                self._confirmar()
+
+    def _confirmar(self):
+        self._conn.commit()
+        self._sin_confirmar = 0
+        self._ultimo_commit = time.monotonic()
+
+    @property
+    def sin_confirmar(self) -> int:
+        return self._sin_confirmar
+
+    def commit(self):
+        with self._lock:
+            self._confirmar()
+
+    def close(self):
+        self.commit()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "LLMResultStore":
+        return self
+
+    def __exit__(self, *excepcion):
+        self.close()
@@ -0,0 +1,173 @@
+import threading
+import time
+from typing import List, Optional, Union
+
+
+class Backend:
+
+    def __init__(self, url: str, limite: int = 1, timeout: float = 120.0):
+        self.url = url
+        self.limite = max(1, int(limite))
+        import ollama
+        self.cliente = ollama.Client(host=url, timeout=timeout)
+        self.en_curso = 0
+        self.fallos_seguidos = 0
+        self.expulsado_hasta = 0.0
+        self.sondeando = False
+        self.atendidas = 0
+        self.errores = 0
+
+    @classmethod
+    def desde_texto(cls, texto: str, timeout: float = 120.0) -> "Backend":
+        # Formato "http://host:11434=4": URL y, opcionalmente, su límite de concurrencia
+        url, _, limite = texto.partition("=")
+        return cls(url.strip(), int(limite) if limite else 1, timeout)
+
+    @property
+    def expulsado(self) -> bool:
+        return self.expulsado_hasta > 0
+
+    def carga(self) -> float:
+        return self.en_curso / self.limite
+
+
+class SinBackendsDisponibles(RuntimeError):
+    pass
+
+
+# Cliente con la misma interfaz generate() que el módulo ollama, para pasarlo como cliente a LlamaAnalyzer.
+# Cada llamada va al backend sano con menos solicitudes en curso relativo a su límite; un backend
+# que falla max_fallos veces seguidas se expulsa por tiempo_expulsion segundos y solo se readmite
+# si responde al chequeo de salud. Las llamadas fallidas se reintentan en otro backend; si todos
+# están expulsados, la solicitud espera hasta espera_maxima segundos a que alguno vuelva.
+class PoolOllama:
+
+    def __init__(self, backends: List[Union[str, Backend]], max_fallos: int = 2,
+                 tiempo_expulsion: float = 30.0, max_intentos: Optional[int] = None, timeout: float = 120.0,
+                 espera_maxima: float = 120.0):
+        self.backends = [b if isinstance(b, Backend) else Backend.desde_texto(b, timeout) for b in backends]
+        if not self.backends:
+            raise ValueError("El pool necesita al menos un backend")
+        self.max_fallos = max(1, int(max_fallos))
+        self.tiempo_expulsion = tiempo_expulsion
+        self.max_intentos = max_intentos or len(self.backends)
+        self.espera_maxima = espera_maxima
+        self._condicion = threading.Condition()
+
+    @property
+    def capacidad(self) -> int:
+        return sum(backend.limite for backend in self.backends)
+
+    def _sano(self, backend: Backend) -> bool:
+        try:
+            backend.cliente.list()
+            return True
+        except Exception:
+            return False
+
+    def verificar_salud(self):
+        for backend in self.backends:
+            sano = self._sano(backend)
+            with self._condicion:
+                if sano:
+                    self._readmitir(backend)
+                elif not backend.expulsado:
+                    self._expulsar(backend)
+                self._condicion.notify_all()
+
+    def _expulsar(self, backend: Backend):
+        backend.expulsado_hasta = time.monotonic() + self.tiempo_expulsion
+        print(f"Backend {backend.url} expulsado por {self.tiempo_expulsion:.0f}s")
+
+    def _readmitir(self, backend: Backend):
+        if backend.expulsado:
+            print(f"Backend {backend.url} readmitido")
+        backend.expulsado_hasta = 0.0
+        backend.fallos_seguidos = 0
+
+    def _sondear(self, backend: Backend):
+        sano = self._sano(backend)
+        with self._condicion:
+            backend.sondeando = False
+            if sano:
+                self._readmitir(backend)
+            else:
+                backend.expulsado_hasta = time.monotonic() + self.tiempo_expulsion
+            self._condicion.notify_all()
+
+    def _adquirir(self, excluidos: set) -> Backend:
+        plazo = time.monotonic() + self.espera_maxima
+        with self._condicion:
+            while True:
+                ahora = time.monotonic()
+                candidatos = [b for b in self.backends if b not in excluidos]
+                if not candidatos:
+                    raise SinBackendsDisponibles("Todos los backends fallaron para esta solicitud")
+
+                # Backends expulsados cuyo castigo venció se sondean fuera del lock
+                vencido = next((b for b in candidatos
+                                if b.expulsado and not b.sondeando and b.expulsado_hasta <= ahora), None)
+                if vencido is not None:
+                    vencido.sondeando = True
+                    self._condicion.release()
+                    try:
+                        self._sondear(vencido)
+                    finally:
+                        self._condicion.acquire()
+                    continue
+
+                libres = [b for b in candidatos if not b.expulsado and b.en_curso < b.limite]
+                if libres:
+                    backend = min(libres, key=lambda b: (b.carga(), b.en_curso))
+                    backend.en_curso += 1
+                    return backend
+
+                if all(b.expulsado and not b.sondeando for b in candidatos):
+                    # Se espera al primero cuya expulsión vence; el sondeo de arriba decide si vuelve
+                    if ahora >= plazo:
+                        raise SinBackendsDisponibles("No hay backends sanos disponibles")
+                    proximo = min(b.expulsado_hasta for b in candidatos)
+                    self._condicion.wait(timeout=min(proximo, plazo) - ahora)
+                    continue
+                self._condicion.wait()
+
+    def _liberar(self, backend: Backend, error: Optional[Exception]):
+        with self._condicion:
+            backend.en_curso -= 1
+            if error is None:
+                backend.atendidas += 1
+                backend.fallos_seguidos = 0
+            else:
+                backend.errores += 1
+                backend.fallos_seguidos += 1
+                print(f"Error en backend {backend.url}: {error}")
+                if not backend.expulsado and backend.fallos_seguidos >= self.max_fallos:
+                    self._expulsar(backend)
+            self._condicion.notify_all()
+
+    def generate(self, **kwargs):
+        excluidos = set()
+        while True:
+            backend = self._adquirir(excluidos)
+            try:
+                respuesta = backend.cliente.generate(**kwargs)
+            except Exception as e:
+                self._liberar(backend, e)
+                excluidos.add(backend)
+                if len(excluidos) >= self.max_intentos:
+                    raise
+                continue
+            self._liberar(backend, None)
+            return respuesta
+
+    def estadisticas(self) -> dict:
+        with self._condicion:
+            return {
+                backend.url: {
+                    "limite": backend.limite,
+                    "atendidas": backend.atendidas,
+                    "errores": backend.errores,
+                    "expulsado": backend.expulsado,
+                }
+                for backend in self.backends
+            }
@@ -1,7 +1,8 @@
+import argparse
+import os
+from typing import Iterator
 import pandas as pd
 
-df = pd.read_csv('../Fillout GGJ26_INSCRIPCION results.csv')
-
 columnas_eliminar = [
     'Submission ID',
     'Status',
@@ -13,8 +14,6 @@ columnas_eliminar = [
     'Network ID'
 ]
 
-df = df.drop(columns=columnas_eliminar, errors='ignore')
-
 renombrar = {
     '¿Cómo calificarías tu nivel de experiencia en desarrollo de juegos?': 'nivel_experiencia',
     '1era prioridad (¿En qué área(s) podrías desempeñarte durante el Game Jam? (Marca 3, en orden de prioridad))': 'rol_1era_prioridad',
@@ -26,9 +25,50 @@ renombrar = {
     'Portafolio / experiencia (opcional):Adjunta enlaces a trabajos previos (Paginas de portafolio, GitHub, itch.io, Drive, etc.)': 'portafolio'
 }
 
-df = df.rename(columns=renombrar)
+# Columnas del export (antes de renombrar) que identifican a la misma inscripción entre corridas
+columnas_identidad = ['Submission started', 'Email']
+
+
+TAMANO_CHUNK = 5000
+
+
+def leer_export(ruta_entrada: str, tamano_chunk: int = TAMANO_CHUNK) -> Iterator[pd.DataFrame]:
+    # Todo se lee como texto: evita que cada chunk infiera tipos distintos (p. ej. celulares como int
+    # en uno y float en otro) y conserva DNI y teléfonos tal cual; DataProcessor convierte lo numérico
+    lector = pd.read_csv(
+        ruta_entrada,
+        usecols=lambda columna: columna not in columnas_eliminar,
+        dtype=str,
+        chunksize=tamano_chunk
+    )
+    with lector:
+        for chunk in lector:
+            yield chunk.rename(columns=renombrar)
+
+
+def preprocesar(ruta_entrada: str, ruta_salida: str, tamano_chunk: int = TAMANO_CHUNK) -> int:
+    filas = 0
+    temporal = f"{ruta_salida}.tmp"
+    for i, chunk in enumerate(leer_export(ruta_entrada, tamano_chunk)):
+        chunk.to_csv(temporal, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        filas += len(chunk)
+    os.replace(temporal, ruta_salida)
+    return filas
+
 
-df.to_csv('./data/inscripciones.csv', index=False)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Limpia el export de Fillout por chunks")
+    parser.add_argument("entrada", nargs="?", default='../Fillout GGJ26_INSCRIPCION results.csv')
+    parser.add_argument("salida", nargs="?", default='./data/inscripciones.csv')
+    parser.add_argument("--tamano-chunk", type=int, default=TAMANO_CHUNK)
+    parser.add_argument("--procesar", action="store_true",
+                        help="Envía los chunks directo a DataProcessor sin escribir el CSV intermedio")
+    args = parser.parse_args()
 
-print(f"Procesamiento completado. Total de registros: {len(df)}")
-print(f"Columnas finales: {list(df.columns)}")
\ No newline at end of file
+    if args.procesar:
+        from data_processor import DataProcessor
+        DataProcessor(leer_export(args.entrada, args.tamano_chunk)).cerrar()
+    else:
+        filas = preprocesar(args.entrada, args.salida, args.tamano_chunk)
+        print(f"Procesamiento completado. Total de registros: {filas}")
+        print(f"Columnas finales: {list(pd.read_csv(args.salida, nrows=0).columns)}")
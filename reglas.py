@@ -0,0 +1,115 @@
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from skills_gazetteer import extraer_skills_serie
+
+UMBRAL_CONFIANZA = 0.8
+
+PATRONES_MOTIVACION = {
+    "Aprendizaje": r'\baprend|\bconocimientos?\b|mejorar mis habilidades|\bcapacitarme',
+    "Networking": r'conocer (?:gente|personas|a otros|nuevas personas)|networking|contactos|\bcomunidad\b',
+    "Reto_personal": r'\bretos?\b|desaf[ií]o|ponerme a prueba|superarme',
+    "Pasion_videojuegos": r'me apasiona|\bpasi[oó]n\b|amo los videojuegos|me encantan? (?:los )?videojuegos',
+    "Experiencia_profesional": r'portafolio|portfolio|experiencia profesional|curr[ií]cul|\bcv\b|industria',
+}
+
+PATRON_SIN_EXPERIENCIA = r'^(?:ninguna?|nada|no tengo(?: experiencia)?|a[uú]n no|todav[ií]a no|sin experiencia)\W*$'
+PATRON_JAMS = r'(\d+)\s*(?:game\s*)?(?:jams?|hackathons?)'
+PATRON_AVANZADO = r'publicad[oa]s?|comercial|steam|profesionalmente|\d+\s*años'
+
+
+def _preparar(textos: pd.Series) -> pd.Series:
+    return (
+        textos.fillna("").astype(str)
+        .str.replace(r'\bnan\b', '', regex=True)
+        .str.strip()
+        .str.lower()
+    )
+
+
+def reglas_motivacion(textos: pd.Series) -> pd.DataFrame:
+    limpios = _preparar(textos)
+    coincidencias = pd.DataFrame({
+        categoria: limpios.str.contains(patron, regex=True)
+        for categoria, patron in PATRONES_MOTIVACION.items()
+    })
+    n_coincidencias = coincidencias.sum(axis=1)
+    vacio = limpios == ""
+
+    etiqueta = coincidencias.idxmax(axis=1).where(n_coincidencias == 1, "General")
+    etiqueta = etiqueta.where(~vacio, "No especificado")
+    confianza = np.select([vacio, n_coincidencias == 1], [1.0, 0.85], default=0.0)
+    return pd.DataFrame({"resultado": etiqueta, "confianza": confianza}, index=textos.index)
+
+
+def reglas_experiencia(textos: pd.Series) -> pd.DataFrame:
+    limpios = _preparar(textos)
+    vacio = limpios == ""
+    sin_experiencia = limpios.str.match(PATRON_SIN_EXPERIENCIA)
+    jams = pd.to_numeric(limpios.str.extract(PATRON_JAMS, expand=False), errors='coerce')
+    avanzado = jams.notna() & limpios.str.contains(PATRON_AVANZADO, regex=True)
+
+    resultados = [
+        {"tiene_proyectos": True, "jams_previas": int(j), "nivel_real": "Avanzado"}
+        if a else
+        {"tiene_proyectos": False, "jams_previas": 0, "nivel_real": "Principiante"}
+        for a, j in zip(avanzado, jams.fillna(0))
+    ]
+    confianza = np.select([vacio | sin_experiencia, avanzado], [1.0, 0.8], default=0.0)
+    return pd.DataFrame({"resultado": resultados, "confianza": confianza}, index=textos.index)
+
+
+def reglas_compromiso(textos: pd.Series) -> pd.DataFrame:
+    # El largo de la respuesta no es evidencia del compromiso: solo se resuelve sin Llama la respuesta
+    # vacía, con el mismo "Bajo" que le asigna LlamaAnalyzer
+    vacio = _preparar(textos) == ""
+    etiqueta = np.where(vacio, "Bajo", "Medio")
+    confianza = np.where(vacio, 1.0, 0.0)
+    return pd.DataFrame({"resultado": etiqueta, "confianza": confianza}, index=textos.index)
+
+
+def reglas_skills(textos: pd.Series) -> pd.DataFrame:
+    resultados = extraer_skills_serie(textos)
+    alguna = np.array([len(skills) > 0 for skills in resultados], dtype=bool)
+    confianza = np.select([alguna, _preparar(textos).str.len() < 200], [0.9, 0.9], default=0.5)
+    return pd.DataFrame({"resultado": resultados, "confianza": confianza}, index=textos.index)
+
+
+REGLAS = {
+    "motivacion": reglas_motivacion,
+    "experiencia": reglas_experiencia,
+    "compromiso": reglas_compromiso,
+    "skills": reglas_skills,
+}
+
+
+class ClasificadorCascada:
+
+    def __init__(self, analyzer, umbral: float = UMBRAL_CONFIANZA):
+        self.analyzer = analyzer
+        self.umbral = umbral
+        self.estadisticas = {tipo: {"reglas": 0, "llm": 0} for tipo in REGLAS}
+
+    def aplicar_reglas(self, textos: List[str], tipo: str) -> pd.DataFrame:
+        reglas = REGLAS[tipo](pd.Series(textos, dtype=object))
+        reglas["confiable"] = reglas["confianza"] >= self.umbral
+        return reglas
+
+    def procesar(self, textos: List[str], tipo: str, cache: Dict = None, reglas: pd.DataFrame = None) -> List:
+        # reglas: resultado previo de aplicar_reglas para los mismos textos, para no evaluarlas dos veces
+        if reglas is None:
+            reglas = self.aplicar_reglas(textos, tipo)
+        escalados = np.flatnonzero(~reglas["confiable"].to_numpy())
+
+        resultados = reglas["resultado"].tolist()
+        if len(escalados) > 0:
+            respuestas = self.analyzer.procesar_batch_con_cache(
+                [textos[i] for i in escalados], tipo, cache
+            )
+            for i, respuesta in zip(escalados, respuestas):
+                resultados[i] = respuesta
+
+        self.estadisticas[tipo]["reglas"] += len(textos) - len(escalados)
+        self.estadisticas[tipo]["llm"] += len(escalados)
+        print(f"✓ {tipo}: {len(textos) - len(escalados)} resueltos por reglas, {len(escalados)} escalados a Llama")
+        return resultados
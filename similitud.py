@@ -0,0 +1,79 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+import numpy as np
+
+UMBRAL_SIMILITUD = 0.8
+TAMANO_SHINGLE = 3
+PERMUTACIONES = 64
+BANDAS = 16
+PRIMO = (1 << 61) - 1
+
+
+def shingles(texto: str, tamano: int = TAMANO_SHINGLE) -> Set[str]:
+    # Trigramas de caracteres: toleran variaciones de conjugación y palabras agregadas en textos cortos
+    texto = f" {texto} "
+    if len(texto) <= tamano:
+        return {texto}
+    return {texto[i:i + tamano] for i in range(len(texto) - tamano + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+# Índice LSH sobre firmas MinHash: las bandas solo proponen candidatos y el umbral se aplica
+# sobre el Jaccard exacto de los trigramas, sin el error de estimación de MinHash
+class IndiceMinHash:
+
+    def __init__(self, umbral: float = UMBRAL_SIMILITUD, permutaciones: int = PERMUTACIONES,
+                 bandas: int = BANDAS, semilla: int = 1):
+        if permutaciones % bandas:
+            raise ValueError("permutaciones debe ser múltiplo de bandas")
+        self.umbral = umbral
+        self.filas_banda = permutaciones // bandas
+        generador = np.random.default_rng(semilla)
+        self._a = generador.integers(1, PRIMO, size=permutaciones, dtype=np.uint64)
+        self._b = generador.integers(0, PRIMO, size=permutaciones, dtype=np.uint64)
+        self._cubetas: List[Dict[bytes, List[str]]] = [defaultdict(list) for _ in range(bandas)]
+        self._shingles: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._shingles
+
+    def _firma(self, conjunto: Set[str]) -> np.ndarray:
+        valores = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in conjunto), dtype=np.uint64, count=len(conjunto))
+        # (a*x + b) mod p con desborde en uint64: no es una permutación exacta pero dispersa lo suficiente
+        return ((np.outer(self._a, valores) + self._b[:, None]) % PRIMO).min(axis=1)
+
+    def _bandas(self, firma: np.ndarray):
+        for i, cubeta in enumerate(self._cubetas):
+            yield cubeta, firma[i * self.filas_banda:(i + 1) * self.filas_banda].tobytes()
+
+    def agregar(self, clave: str):
+        if clave in self._shingles:
+            return
+        conjunto = shingles(clave)
+        self._shingles[clave] = conjunto
+        for cubeta, banda in self._bandas(self._firma(conjunto)):
+            cubeta[banda].append(clave)
+
+    def vecino(self, clave: str) -> Optional[str]:
+        if clave in self._shingles:
+            return clave
+        conjunto = shingles(clave)
+        candidatos = set()
+        for cubeta, banda in self._bandas(self._firma(conjunto)):
+            candidatos.update(cubeta.get(banda, ()))
+
+        mejor, mejor_similitud = None, self.umbral
+        for candidato in sorted(candidatos):
+            similitud = jaccard(conjunto, self._shingles[candidato])
+            if similitud >= mejor_similitud:
+                mejor, mejor_similitud = candidato, similitud
+        return mejor
@@ -0,0 +1,108 @@
+import re
+from typing import List
+import pandas as pd
+from llm_store import normalizar_texto
+
+MAX_SKILLS = 15
+
+# Alias que son palabras comunes ("desde scratch", "la cultura maya", "notion of") solo cuentan
+# con un calificativo; el nombre canónico por sí solo no se busca en el texto
+GAZETTEER = {
+    # Motores
+    "Unity": ["unity", "unity3d", "unity 3d"],
+    "Unreal Engine": ["unreal engine", "unreal", "ue4", "ue5", "ue 4", "ue 5"],
+    "Godot": ["godot", "godot engine", "gdscript"],
+    "GameMaker": ["gamemaker", "game maker", "game maker studio", "gms2"],
+    "RPG Maker": ["rpg maker", "rpgmaker"],
+    "Construct": ["construct 2", "construct 3"],
+    "Roblox Studio": ["roblox studio", "roblox"],
+    "Phaser": ["phaser", "phaser.js"],
+    "Pygame": ["pygame"],
+    "Scratch": ["mit scratch", "scratch mit", "scratch 3"],
+    # Lenguajes
+    "C#": ["c#", "c sharp", "csharp"],
+    "C++": ["c++", "cpp"],
+    "C": ["lenguaje c"],
+    "Python": ["python"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "node.js", "nodejs"],
+    "TypeScript": ["typescript"],
+    "Lua": ["lua"],
+    "HTML/CSS": ["html", "css", "html5"],
+    # Arte, audio y diseño
+    "Blender": ["blender"],
+    "Maya": ["autodesk maya", "maya autodesk", "maya 3d"],
+    "3ds Max": ["3ds max", "3dsmax"],
+    "ZBrush": ["zbrush"],
+    "Substance Painter": ["substance painter", "substance 3d painter", "adobe substance"],
+    "Photoshop": ["photoshop", "adobe photoshop"],
+    "Illustrator": ["illustrator", "adobe illustrator"],
+    "Adobe Flash": ["adobe flash", "macromedia flash", "adobe animate"],
+    "After Effects": ["after effects"],
+    "Krita": ["krita"],
+    "Aseprite": ["aseprite"],
+    "Spine": ["spine 2d"],
+    "Figma": ["figma"],
+    "FL Studio": ["fl studio"],
+    "Ableton": ["ableton", "ableton live"],
+    "Audacity": ["audacity"],
+    "FMOD": ["fmod"],
+    # Herramientas
+    "Git": ["git"],
+    "GitHub": ["github"],
+    "GitLab": ["gitlab"],
+    "Trello": ["trello"],
+    "Jira": ["jira"],
+}
+
+# Para canonizar lo que devuelve Llama también vale el nombre canónico ("Maya" -> "Maya")
+ALIAS_CANONICO = {
+    normalizar_texto(alias): canonico
+    for canonico, aliases in GAZETTEER.items()
+    for alias in aliases + [canonico]
+}
+
+# Un único patrón con los alias del gazetteer, los más largos primero para que
+# "unreal engine" gane sobre "unreal" y "c++" sobre "c". Se aceptan dígitos pegados
+# al final (python3, godot4, unity2022, c++17) pero no letras.
+PATRON_SKILLS = re.compile(
+    r'(?<![\w#+.])(' +
+    "|".join(
+        re.escape(alias).replace(r'\ ', r'\s+')
+        for alias in sorted({a for aliases in GAZETTEER.values() for a in aliases}, key=len, reverse=True)
+    ) +
+    r')(?=\d*(?![\w#+]))'
+)
+
+
+def canonizar(skill: str) -> str:
+    return ALIAS_CANONICO.get(normalizar_texto(skill), str(skill).strip())
+
+
+def _unicos(skills: List[str]) -> List[str]:
+    return list(dict.fromkeys(skills))[:MAX_SKILLS]
+
+
+def extraer_skills_serie(textos: pd.Series) -> List[List[str]]:
+    normalizados = (
+        textos.fillna("").astype(str)
+        .str.normalize('NFKD')
+        .str.encode('ascii', 'ignore').str.decode('ascii')
+        .str.lower()
+    )
+    return [
+        _unicos([ALIAS_CANONICO[normalizar_texto(alias)] for alias in encontrados])
+        for encontrados in normalizados.str.findall(PATRON_SKILLS)
+    ]
+
+
+def extraer_skills_df(df: pd.DataFrame,
+                      columnas: List[str] = ('experiencia_juegos', 'experiencia_profesional')) -> List[List[str]]:
+    textos = df[columnas[0]].fillna("").astype(str)
+    for columna in columnas[1:]:
+        textos = textos + " " + df[columna].fillna("").astype(str)
+    return extraer_skills_serie(textos)
+
+
+def combinar_skills(base: List[str], extra: List[str]) -> List[str]:
+    return _unicos(list(base) + [canonizar(skill) for skill in (extra or [])])
@@ -0,0 +1,58 @@
+import os
+import sys
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from deduplicacion import deduplicar
+
+
+def inscripcion(nombre, apellido, dni, email, celular, actualizado="Sun Jan 11 2026 15:05:00 GMT-0500"):
+    return {
+        'Nombre(s)': nombre, 'Apellidos(s)': apellido, 'Edad': "22", 'DNI/CE': dni,
+        'Email': email, 'Número de celular': celular, 'Last updated': actualizado,
+    }
+
+
+def test_celulares_de_relleno_no_unen_inscritos():
+    df = pd.DataFrame([
+        inscripcion("Ana", "Quispe", "", "ana.quispe@correo.pe", "999999999"),
+        inscripcion("Luis", "Mamani", "", "luis.mamani@correo.pe", "999999999"),
+        inscripcion("Rosa", "Huamán", "", "rosa.huaman@correo.pe", "0"),
+        inscripcion("Jorge", "Condori", "", "jorge.condori@correo.pe", "0"),
+    ])
+    conservadas, estadisticas = deduplicar(df)
+    assert len(conservadas) == 4
+    assert estadisticas["eliminadas"] == 0
+
+
+def test_celular_compartido_por_personas_distintas():
+    df = pd.DataFrame([
+        inscripcion("Ana", "Quispe", "73363933", "ana.quispe@correo.pe", "+51 951 234 876"),
+        inscripcion("Carlos", "Torres", "41852036", "carlos.torres@correo.pe", "951234876"),
+    ])
+    conservadas, _ = deduplicar(df)
+    assert len(conservadas) == 2
+
+
+def test_dni_distinto_nunca_se_une():
+    # Mismo email y celular pero DNI distinto: no se elimina ninguna inscripción
+    df = pd.DataFrame([
+        inscripcion("Ana", "Quispe", "73363933", "ana.quispe@correo.pe", "951234876"),
+        inscripcion("Ana", "Quispe", "73363934", "ana.quispe@correo.pe", "951234876"),
+    ])
+    conservadas, _ = deduplicar(df)
+    assert len(conservadas) == 2
+
+
+def test_reenvio_se_une_y_conserva_la_ultima_actualizacion():
+    df = pd.DataFrame([
+        inscripcion("Ana", "Quispe", "73363933", "ana.quispe@correo.pe", "951234876",
+                     "Sun Jan 11 2026 15:05:00 GMT-0500"),
+        inscripcion("Ana", "Quispe", "", "ANA.QUISPE@correo.pe ", "",
+                     "Mon Jan 12 2026 09:00:00 GMT-0500"),
+        inscripcion("ana", "quispe", "", "otro@correo.pe", "+51 951 234 876",
+                     "Sat Jan 10 2026 09:00:00 GMT-0500"),
+    ])
+    conservadas, estadisticas = deduplicar(df)
+    assert estadisticas["eliminadas"] == 2
+    assert conservadas.index.tolist() == [1]
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+from artefactos import ARCHIVOS, DIRECTORIO_SNAPSHOTS, PUNTERO_SNAPSHOT, snapshot_vigente
+from preprocess_data import preprocesar
+
+DIRECTORIO_DATOS = "data"
+SNAPSHOTS_CONSERVADOS = 3
+
+
+def _nuevo_id() -> str:
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def _escribir_atomico(ruta: str, contenido: str):
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def encolar(ruta_export: str, crudo: bool = True, directorio: str = DIRECTORIO_DATOS) -> str:
+    cola = os.path.join(directorio, "cola")
+    os.makedirs(cola, exist_ok=True)
+    trabajo_id = _nuevo_id()
+    trabajo = {"export": os.path.abspath(ruta_export), "crudo": crudo}
+    _escribir_atomico(os.path.join(cola, f"{trabajo_id}.json"), json.dumps(trabajo, ensure_ascii=False))
+    return trabajo_id
+
+
+class Worker:
+
+    def __init__(self, directorio: str = DIRECTORIO_DATOS, opciones_procesador: dict = None,
+                 conservar: int = SNAPSHOTS_CONSERVADOS):
+        self.directorio = directorio
+        self.cola = os.path.join(directorio, "cola")
+        self.en_proceso = os.path.join(self.cola, "en_proceso")
+        self.fallidos = os.path.join(self.cola, "fallidos")
+        self.snapshots = os.path.join(directorio, DIRECTORIO_SNAPSHOTS)
+        self.opciones = opciones_procesador or {}
+        self.conservar = conservar
+        self._firmas = {}
+        self._candidatas = {}
+        for ruta in (self.cola, self.en_proceso, self.fallidos, self.snapshots):
+            os.makedirs(ruta, exist_ok=True)
+
+    def _recuperar_trabajos(self):
+        # Trabajos que quedaron a medias por una caída del worker vuelven a la cola
+        for nombre in os.listdir(self.en_proceso):
+            os.replace(os.path.join(self.en_proceso, nombre), os.path.join(self.cola, nombre))
+        for nombre in os.listdir(self.snapshots):
+            if nombre.startswith("."):
+                shutil.rmtree(os.path.join(self.snapshots, nombre), ignore_errors=True)
+
+    def _tomar_trabajo(self):
+        for nombre in sorted(os.listdir(self.cola)):
+            if not nombre.endswith(".json"):
+                continue
+            destino = os.path.join(self.en_proceso, nombre)
+            try:
+                os.rename(os.path.join(self.cola, nombre), destino)
+            except FileNotFoundError:
+                continue
+            with open(destino, 'r', encoding='utf-8') as f:
+                return destino, json.load(f)
+        return None
+
+    def _revisar_export(self, ruta: str, crudo: bool = True):
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return
+        firma = (estado.st_mtime_ns, estado.st_size)
+
+        if ruta not in self._firmas:
+            # Al arrancar solo se procesa el export si todavía no hay snapshot publicado
+            self._firmas[ruta] = firma if snapshot_vigente(self.directorio) else None
+        if firma == self._firmas[ruta]:
+            return
+
+        # El export debe mantenerse igual durante un ciclo para no leerlo mientras se escribe
+        if self._candidatas.get(ruta) != firma:
+            self._candidatas[ruta] = firma
+            return
+        del self._candidatas[ruta]
+        self._firmas[ruta] = firma
+        trabajo_id = encolar(ruta, crudo=crudo, directorio=self.directorio)
+        print(f"Nuevo export detectado en {ruta}, trabajo {trabajo_id} encolado")
+
+    def procesar(self, ruta_export: str, crudo: bool = True) -> str:
+        version = _nuevo_id()
+        temporal = os.path.join(self.snapshots, f".{version}")
+        os.makedirs(temporal)
+        try:
+            # Partir del snapshot vigente permite que DataProcessor solo reprocese filas nuevas o editadas
+            anterior = snapshot_vigente(self.directorio)
+            origen = os.path.join(self.snapshots, anterior) if anterior else self.directorio
+            for archivo in (ARCHIVOS["procesados"], ARCHIVOS["agregados"]):
+                if os.path.exists(os.path.join(origen, archivo)):
+                    shutil.copy2(os.path.join(origen, archivo), temporal)
+
+            csv_path = os.path.join(temporal, "inscripciones.csv")
+            if crudo:
+                preprocesar(ruta_export, csv_path)
+            else:
+                shutil.copy2(ruta_export, csv_path)
+
+            # Import diferido: encolar trabajos no debe cargar el stack de Llama
+            from data_processor import DataProcessor
+            # La cache de Llama queda en el directorio del worker y no dentro del snapshot: sus resultados
+            # dependen solo del texto y las opciones, así que sirve a todos los trabajos
+            DataProcessor(csv_path, incremental=True, directorio_salida=temporal,
+                          directorio_cache=self.directorio, **self.opciones).cerrar()
+            os.rename(temporal, os.path.join(self.snapshots, version))
+        except BaseException:
+            shutil.rmtree(temporal, ignore_errors=True)
+            raise
+
+        _escribir_atomico(os.path.join(self.snapshots, PUNTERO_SNAPSHOT), version)
+        print(f"Snapshot {version} publicado")
+        self._podar()
+        return version
+
+    def _podar(self):
+        vigente = snapshot_vigente(self.directorio)
+        versiones = sorted(
+            nombre for nombre in os.listdir(self.snapshots)
+            if not nombre.startswith(".") and os.path.isdir(os.path.join(self.snapshots, nombre))
+        )
+        for nombre in versiones[:-self.conservar]:
+            if nombre != vigente:
+                shutil.rmtree(os.path.join(self.snapshots, nombre), ignore_errors=True)
+
+    def _ejecutar_trabajo(self, ruta_trabajo: str, trabajo: dict):
+        nombre = os.path.basename(ruta_trabajo)
+        print(f"\nProcesando trabajo {nombre} ({trabajo['export']})")
+        try:
+            self.procesar(trabajo["export"], trabajo.get("crudo", True))
+        except Exception as e:
+            print(f"Error en el trabajo {nombre}: {str(e)}")
+            trabajo["error"] = str(e)
+            _escribir_atomico(os.path.join(self.fallidos, nombre), json.dumps(trabajo, ensure_ascii=False))
+            os.remove(ruta_trabajo)
+            return
+        os.remove(ruta_trabajo)
+
+    def ejecutar(self, vigilar=(), intervalo: float = 5.0, una_vez: bool = False, crudo: bool = True):
+        self._recuperar_trabajos()
+        print(f"Worker iniciado, cola en {self.cola}")
+        while True:
+            for ruta in vigilar:
+                self._revisar_export(ruta, crudo)
+
+            tomado = self._tomar_trabajo()
+            if tomado is not None:
+                self._ejecutar_trabajo(*tomado)
+                continue
+            if una_vez:
+                return
+            time.sleep(intervalo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker que procesa exports de Fillout y publica snapshots para el dashboard")
+    parser.add_argument("--encolar", metavar="EXPORT", help="Encola un export y termina")
+    parser.add_argument("--preprocesado", action="store_true", help="El export ya pasó por preprocess_data.py")
+    parser.add_argument("--vigilar", metavar="EXPORT", nargs="*", default=[], help="Exports a vigilar por cambios")
+    parser.add_argument("--intervalo", type=float, default=5.0)
+    parser.add_argument("--una-vez", action="store_true", help="Vacía la cola y termina")
+    parser.add_argument("--concurrencia", type=int, default=None,
+                        help="Llamadas simultáneas a Llama (por defecto 1, o la capacidad total del pool)")
+    parser.add_argument("--backends", metavar="URL[=N]", nargs="*", default=[],
+                        help="Servidores Ollama con su límite de concurrencia, p. ej. http://pc2:11434=4")
+    parser.add_argument("--tamano-lote", type=int, default=1)
+    parser.add_argument("--fusionado", action="store_true")
+    parser.add_argument("--reglas", action="store_true")
+    parser.add_argument("--progreso", action="store_true", help="Barra de progreso en lugar de una línea por resultado")
+    parser.add_argument("--similitud", type=float, default=None, metavar="UMBRAL",
+                        help="Reutiliza la clasificación de respuestas casi idénticas (Jaccard de trigramas, p. ej. 0.8)")
+    args = parser.parse_args()
+
+    if args.encolar:
+        trabajo_id = encolar(args.encolar, crudo=not args.preprocesado)
+        print(f"Trabajo {trabajo_id} encolado")
+    else:
+        pool = None
+        if args.backends:
+            from ollama_pool import PoolOllama
+            pool = PoolOllama(args.backends)
+            pool.verificar_salud()
+        worker = Worker(opciones_procesador={
+            "cliente_llm": pool,
+            "max_concurrencia": args.concurrencia or (pool.capacidad if pool else 1),
+            "tamano_lote": args.tamano_lote,
+            "modo_fusionado": args.fusionado,
+            "usar_reglas": args.reglas,
+            "umbral_similitud": args.similitud,
+            "barra_progreso": args.progreso,
+        })
+        worker.ejecutar(vigilar=args.vigilar, intervalo=args.intervalo, una_vez=args.una_vez,
+                        crudo=not args.preprocesado)